@@ -0,0 +1,204 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import Generadores
+from FlujoMaximo import ALGORITHMS, DenseGraph, Graph, SolverStats
+
+SIZES = {
+    "small": {
+        "random_sparse": {"n": 500, "m": 3000},
+        "grid": {"rows": 20, "cols": 20},
+        "layered": {"layers": 10, "width": 30},
+        "bipartite": {"left": 200, "right": 200},
+        "ak": {"k": 60},
+    },
+    "medium": {
+        "random_sparse": {"n": 5000, "m": 40000},
+        "grid": {"rows": 60, "cols": 60},
+        "layered": {"layers": 30, "width": 100},
+        "bipartite": {"left": 2000, "right": 2000},
+        "ak": {"k": 300},
+    },
+    "large": {
+        "random_sparse": {"n": 50000, "m": 400000},
+        "grid": {"rows": 200, "cols": 200},
+        "layered": {"layers": 100, "width": 300},
+        "bipartite": {"left": 20000, "right": 20000},
+        "ak": {"k": 1000},
+    },
+}
+
+# El motor denso solo se mide si NumPy está instalado y el grafo es pequeño
+DENSE_LIMIT = 3000
+
+
+def build(solver, vertices, edges):
+    g = DenseGraph(vertices) if solver == "dense" else Graph(vertices)
+    for u, v, w in edges:
+        g.add_edge(u, v, w)
+    return g
+
+
+def measure(solver, vertices, edges, source, sink, memory=True):
+    algorithm = "edmonds_karp" if solver == "dense" else solver
+    start = time.perf_counter()
+    g = build(solver, vertices, edges)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    max_flow, _ = g.max_flow(source, sink, algorithm, trace="off")
+    solve_seconds = time.perf_counter() - start
+    record = {
+        "solver": solver,
+        "max_flow": max_flow,
+        "build_seconds": build_seconds,
+        "solve_seconds": solve_seconds,
+    }
+    # Los contadores se toman en otra corrida para no inflar solve_seconds
+    g = build(solver, vertices, edges)
+    stats = SolverStats()
+    g.max_flow(source, sink, algorithm, trace="off", stats=stats)
+    record.update(bfs_calls=stats.bfs_calls, nodes_visited=stats.nodes_visited,
+                  edges_scanned=stats.edges_scanned, augmentations=stats.augmentations,
+                  average_path_length=stats.average_path_length)
+    del g
+
+    if memory:
+        # Segunda corrida aparte: tracemalloc distorsiona los tiempos
+        tracemalloc.start()
+        g = build(solver, vertices, edges)
+        g.max_flow(source, sink, algorithm, trace="off")
+        record["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return record
+
+
+def dense_available():
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def run(size="small", solvers=None, cases=None, memory=True, seed=0):
+    solvers = list(solvers or ALGORITHMS)
+    results = []
+    for case, params in SIZES[size].items():
+        if cases and case not in cases:
+            continue
+        generator = Generadores.GENERATORS[case]
+        if case != "ak":
+            params = dict(params, seed=seed)
+        vertices, edges, source, sink = generator(**params)
+        values = set()
+        for solver in solvers:
+            if solver == "dense" and (vertices > DENSE_LIMIT or not dense_available()):
+                continue
+            record = measure(solver, vertices, edges, source, sink, memory)
+            record.update(case=case, params=params, vertices=vertices, edges=len(edges))
+            values.add(record["max_flow"])
+            results.append(record)
+            print(f"{case:14} {solver:26} flujo={record['max_flow']:<10} "
+                  f"construcción={record['build_seconds']:.3f}s solución={record['solve_seconds']:.3f}s "
+                  f"bfs={record['bfs_calls']}", file=sys.stderr)
+        for record in results:
+            if record["case"] == case:
+                record["agree"] = len(values) == 1
+    return results
+
+
+HEAVY_MODULES = ("matplotlib", "networkx", "pandas", "numpy")
+
+
+def measure_import(module):
+    # Costo de importar el módulo en un intérprete limpio, según -X importtime
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                               cwd=os.path.dirname(os.path.abspath(__file__)),
+                               capture_output=True, text=True, check=True)
+    cumulative = None
+    loaded = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = [field.strip() for field in line[len("import time:"):].split("|")]
+        if not fields[1].isdigit():
+            continue
+        name = fields[2]
+        if name == module:
+            cumulative = int(fields[1])
+        if name.split(".")[0] in HEAVY_MODULES:
+            loaded.add(name.split(".")[0])
+    return {"module": module, "cumulative_us": cumulative, "heavy_modules": sorted(loaded)}
+
+
+def commit_id():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, report):
+    # Razón de tiempos contra una corrida anterior (>1 significa más lento ahora)
+    previous = {(r["case"], r["solver"]): r for r in baseline["results"]}
+    for record in report["results"]:
+        old = previous.get((record["case"], record["solver"]))
+        if old and old["solve_seconds"] > 0:
+            ratio = record["solve_seconds"] / old["solve_seconds"]
+            print(f"{record['case']:14} {record['solver']:13} {ratio:6.2f}x", file=sys.stderr)
+    previous = {r["module"]: r for r in baseline.get("imports", [])}
+    for record in report.get("imports", []):
+        old = previous.get(record["module"])
+        if old and old["cumulative_us"] and record["cumulative_us"]:
+            ratio = record["cumulative_us"] / old["cumulative_us"]
+            print(f"import {record['module']:21} {ratio:6.2f}x", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide el rendimiento de los algoritmos de flujo máximo.")
+    parser.add_argument("--size", choices=SIZES, default="small")
+    parser.add_argument("--solvers", nargs="+", choices=ALGORITHMS + ("dense",), default=list(ALGORITHMS))
+    parser.add_argument("--cases", nargs="+", choices=Generadores.GENERATORS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="no medir la memoria pico")
+    parser.add_argument("--no-imports", action="store_true", help="no medir el tiempo de importación")
+    parser.add_argument("-o", "--output", help="archivo JSON de resultados")
+    parser.add_argument("--baseline", help="JSON de una corrida anterior para comparar tiempos")
+    args = parser.parse_args(argv)
+
+    results = run(args.size, args.solvers, args.cases, not args.no_memory, args.seed)
+    report = {
+        "commit": commit_id(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "size": args.size,
+        "results": results,
+    }
+    if not args.no_imports:
+        report["imports"] = [measure_import(module) for module in ("FlujoMaximo", "main")]
+        for record in report["imports"]:
+            print(f"import {record['module']:14} {record['cumulative_us'] / 1000:.1f} ms "
+                  f"pesados={','.join(record['heavy_modules']) or '-'}", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as stream:
+            json.dump(report, stream, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline) as stream:
+            compare(json.load(stream), report)
+
+    return 0 if all(r["agree"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+import hashlib
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict, namedtuple
+
+from FlujoMaximo import LabeledGraph
+
+CachedResult = namedtuple("CachedResult", ["max_flow", "flows", "source_side", "cut_edges"])
+
+
+def fingerprint(edges):
+    # Huella canónica de la lista de aristas: sha256 de las aristas ordenadas, de
+    # modo que no depende del orden y cualquier cambio produce otra huella. repr
+    # escapa los saltos de línea de las etiquetas, así que el separador no es ambiguo.
+    lines = sorted(repr(tuple(edge)) for edge in edges)
+    digest = hashlib.sha256("\n".join(lines).encode()).hexdigest()
+    return f"{len(lines)}-{digest}"
+
+
+def _freeze(result):
+    # El mismo objeto se entrega en cada acierto: sin listas ni conjuntos mutables
+    # nadie puede alterar lo que verán los demás
+    return CachedResult(result.max_flow, tuple(result.flows), frozenset(result.source_side),
+                        tuple(result.cut_edges))
+
+
+def _key(graph_id, source, sink, algorithm):
+    return hashlib.sha256(repr((graph_id, source, sink, algorithm)).encode()).hexdigest()
+
+
+class ResultCache:
+    # Memoria LRU con un nivel opcional en disco (SQLite) para resultados repetidos
+    def __init__(self, maxsize=128, path=None):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()  # llave -> (huella del grafo, resultado)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path, check_same_thread=False)
+            self.db.execute("CREATE TABLE IF NOT EXISTS results "
+                            "(key TEXT PRIMARY KEY, graph TEXT NOT NULL, value BLOB NOT NULL)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS results_graph ON results (graph)")
+            self.db.commit()
+
+    def _remember(self, key, graph_id, result):
+        self.entries[key] = (graph_id, result)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if self.db is not None:
+                row = self.db.execute("SELECT graph, value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    result = _freeze(pickle.loads(row[1]))
+                    self._remember(key, row[0], result)
+                    self.hits += 1
+                    return result
+            self.misses += 1
+            return None
+
+    def put(self, key, graph_id, result):
+        result = _freeze(result)
+        with self.lock:
+            self._remember(key, graph_id, result)
+            if self.db is not None:
+                self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                                (key, graph_id, pickle.dumps(result)))
+                self.db.commit()
+
+    def solve(self, edges, source, sink, algorithm="dinic", graph_id=None):
+        # graph_id permite reutilizar una huella ya calculada para la misma red
+        if graph_id is None:
+            graph_id = fingerprint(edges)
+        key = _key(graph_id, source, sink, algorithm)
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        g = LabeledGraph()
+        for u, v, w in edges:
+            g.add_edge(u, v, w)
+        max_flow, _ = g.max_flow(source, sink, algorithm, trace="off")
+        source_side, cut_edges = g.min_cut()
+        result = _freeze(CachedResult(max_flow, g.get_flows(), source_side, cut_edges))
+        self.put(key, graph_id, result)
+        return result
+
+    def invalidate(self, edges=None, graph_id=None):
+        # Descarta todas las consultas guardadas de una red que ya cambió
+        if graph_id is None:
+            graph_id = fingerprint(edges)
+        with self.lock:
+            for key in [k for k, (g, _) in self.entries.items() if g == graph_id]:
+                del self.entries[key]
+            if self.db is not None:
+                self.db.execute("DELETE FROM results WHERE graph = ?", (graph_id,))
+                self.db.commit()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            if self.db is not None:
+                self.db.execute("DELETE FROM results")
+                self.db.commit()
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
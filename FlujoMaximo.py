@@ -1,150 +1,1557 @@
-import matplotlib.pyplot as plt
-import networkx as nx
-from collections import deque
-import pandas as pd
-from matplotlib.gridspec import GridSpec
-from matplotlib.widgets import Button
+import heapq
+import json
+import time
+from array import array
+from collections import OrderedDict, deque, namedtuple
+from functools import wraps
+
+# Las bibliotecas de gráficos se importan al visualizar por primera vez
+# (ver _load_plotting); el solver solo depende de la biblioteca estándar.
+plt = None
+nx = None
+GridSpec = None
+Button = None
+
+ALGORITHMS = ("edmonds_karp", "edmonds_karp_scaling", "edmonds_karp_bidirectional", "dinic", "push_relabel")
+
+COST_ALGORITHMS = ("successive_shortest_paths", "cost_scaling")
+
+FlowResult = namedtuple("FlowResult", ["max_flow", "flows", "trace"])
+CostFlowResult = namedtuple("CostFlowResult", ["cost", "max_flow", "flows"])
+
+
+class SolveCancelled(Exception):
+    # La lanza el callback de progreso para detener un cálculo en curso
+    pass
+
+
+TRACE_LEVELS = ("off", "summary", "full")
+
+
+class Trace:
+    # Traza compacta de aumentos: los caminos se guardan como tramos de un solo
+    # arreglo de nodos y los flujos en arreglos paralelos. Las filas legibles
+    # (iteración, [(u, v), ...], flujo del camino, flujo total) se arman al leerlas.
+    def __init__(self, level="full"):
+        if level not in TRACE_LEVELS:
+            raise ValueError(f"Nivel de traza desconocido: {level}")
+        self.level = level
+        self.keep_paths = level == "full"
+        self.nodes = array('i')
+        self.offsets = array('q', [0])
+        self.flows = array('q')
+        self.totals = array('q')
+        self.labels = None  # Etiquetas para mostrar los nodos (ver LabeledGraph)
+
+    def record(self, path, path_flow, total):
+        if self.level == "off":
+            return
+        if self.keep_paths:
+            self.nodes.extend(path)
+        self.offsets.append(len(self.nodes))
+        self.flows.append(path_flow)
+        self.totals.append(total)
+
+    def __len__(self):
+        return len(self.flows)
+
+    def path(self, i):
+        nodes = self.nodes[self.offsets[i]:self.offsets[i + 1]]
+        if self.labels is not None:
+            return [self.labels[u] for u in nodes]
+        return list(nodes)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("Índice fuera de la traza")
+        nodes = self.path(i)
+        return i + 1, list(zip(nodes, nodes[1:])), self.flows[i], self.totals[i]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class SolverStats:
+    # Contadores que llenan los solvers cuando se les pasa una instancia; sin ella
+    # no se cuenta nada. Con timers=True se mide también el tiempo por fase y
+    # hook(evento, stats) se llama en cada aumento ("augment") o fase ("phase").
+    def __init__(self, timers=False, hook=None):
+        self.algorithm = None
+        self.seconds = 0.0
+        self.bfs_calls = 0
+        self.nodes_visited = 0
+        self.edges_scanned = 0
+        self.augmentations = 0
+        self.path_length_total = 0
+        self.phases = 0
+        self.pushes = 0
+        self.relabels = 0
+        self.gaps = 0
+        self.timers = {} if timers else None
+        self.hook = hook
+
+    @property
+    def average_path_length(self):
+        if not self.augmentations:
+            return 0.0
+        return self.path_length_total / self.augmentations
+
+    def add_time(self, phase, seconds):
+        self.timers[phase] = self.timers.get(phase, 0.0) + seconds
+
+    def augmented(self, path_length):
+        self.augmentations += 1
+        self.path_length_total += path_length
+        if self.hook is not None:
+            self.hook("augment", self)
+
+    def phase(self):
+        self.phases += 1
+        if self.hook is not None:
+            self.hook("phase", self)
+
+    def as_dict(self):
+        data = {key: value for key, value in vars(self).items() if key != "hook"}
+        data["average_path_length"] = self.average_path_length
+        return data
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.as_dict(), **kwargs)
+
+    def summary(self):
+        return (f"BFS: {self.bfs_calls} · nodos visitados: {self.nodes_visited} · "
+                f"arcos explorados: {self.edges_scanned} · aumentos: {self.augmentations} · "
+                f"longitud media: {self.average_path_length:.1f}")
+
+
+def _trace_level(trace):
+    if trace is True:
+        return "full"
+    return trace or "off"
+
+
+def _engine(solver):
+    # Los motores públicos llevan el registro de source, sink y flow_value aunque
+    # se llamen directamente (edmonds_karp(s, t) es la entrada histórica): con otro
+    # par de terminales se parte de cero, con el mismo se aumenta desde el flujo actual
+    @wraps(solver)
+    def run(self, source, sink, progress=None, table=None):
+        if (source, sink) != (self.source, self.sink):
+            if self.flow_value:
+                self.reset()
+            self.source, self.sink = source, sink
+        self.algorithm = solver.__name__
+        max_flow, table = solver(self, source, sink, progress, table)
+        self.flow_value += max_flow
+        return max_flow, table
+    return run
+
 
 class Graph:
     def __init__(self, vertices):
-        self.graph = [[0] * vertices for _ in range(vertices)]
         self.ROW = vertices
-        self.original_graph = [[0] * vertices for _ in range(vertices)]
-        self.G = nx.DiGraph()
-        self.fig = None
-        self.gs = None
-        self.ax0 = None
-        self.ax1 = None
-        self.button = None
-        self.current_iteration = 0
-        self.flag = False
-        self.fig_pos = (100, 100)  # Posición deseada de la ventana gráfica
+        # Lista de aristas con arcos emparejados: el arco e y su reverso e ^ 1.
+        # first[u] es el primer arco que sale de u y next_arc[e] el siguiente.
+        self.first = array('i', [-1]) * vertices
+        self.head = array('i')
+        self.next_arc = array('i')
+        self.residual = array('q')  # Capacidad residual de cada arco
+        self.capacity = array('q')  # Capacidad original (0 en los arcos reversos)
+        self.cost = None  # Costo por unidad de cada arco; se reserva con el primer costo
+        # Último problema resuelto, para poder re-resolver tras cambios de capacidad
+        self.source = None
+        self.sink = None
+        self.algorithm = None
+        self.flow_value = 0
+        self.stats = None  # SolverStats del cálculo en curso, si se pidió
 
+    def _add_arc(self, u, v, w):
+        self.head.append(v)
+        self.next_arc.append(self.first[u])
+        self.first[u] = len(self.head) - 1
+        self.residual.append(w)
+        self.capacity.append(w)
 
-    def add_edge(self, u, v, w):
-        self.graph[u][v] = w
-        self.original_graph[u][v] = w
-        self.G.add_edge(u, v, capacity=w)
+    @classmethod
+    def from_arrays(cls, first, head, next_arc, capacity, residual=None):
+        # Construye el grafo sobre arreglos ya existentes (memoria compartida o
+        # archivos mapeados); su estructura queda de solo lectura
+        graph = cls(0)
+        graph.ROW = len(first)
+        graph.first = first
+        graph.head = head
+        graph.next_arc = next_arc
+        graph.capacity = capacity
+        if residual is None:
+            graph.reset()
+        else:
+            graph.residual = residual
+        return graph
 
-    def bfs(self, s, t, parent):
-        visited = [False] * self.ROW
-        queue = deque()
-        queue.append(s)
-        visited[s] = True
+    def reset(self):
+        # Regresa al flujo cero para poder resolver de nuevo el mismo grafo
+        if isinstance(self.residual, memoryview):
+            self.residual[:] = self.capacity
+        else:
+            self.residual = array('q', self.capacity)
+        self.flow_value = 0
 
-        while queue:
-            u = queue.popleft()
+    def _grow(self, vertices):
+        self.first.extend(array('i', [-1]) * (vertices - self.ROW))
+        self.ROW = vertices
+
+    def add_edge(self, u, v, w, cost=0):
+        if u >= self.ROW or v >= self.ROW:
+            self._grow(max(u, v) + 1)
+        if cost and self.cost is None:
+            self.cost = array('q', [0]) * len(self.head)
+        self._add_arc(u, v, w)
+        self._add_arc(v, u, 0)
+        if self.cost is not None:
+            # El reverso devuelve el costo al cancelar flujo
+            self.cost.append(cost)
+            self.cost.append(-cost)
+
+    def has_node(self, u):
+        return 0 <= u < self.ROW
+
+    def find_edge(self, u, v):
+        if u >= self.ROW:
+            return None
+        head, next_arc = self.head, self.next_arc
+        e = self.first[u]
+        while e != -1:
+            if head[e] == v and not e & 1:
+                return e
+            e = next_arc[e]
+        return None
 
-            for ind, val in enumerate(self.graph[u]):
-                if visited[ind] == False and val > 0:
-                    queue.append(ind)
-                    visited[ind] = True
-                    parent[ind] = u
+    def update_capacity(self, u, v, new_cap):
+        if new_cap < 0:
+            raise ValueError("La capacidad no puede ser negativa")
+        e = self.find_edge(u, v)
+        if e is None:
+            self.add_edge(u, v, new_cap)
+            return
 
-        return visited[t]
+        flow = self.capacity[e] - self.residual[e]
+        if new_cap < flow and u != v and self.source is None:
+            # Tras multi_flow no hay un par origen/destino hacia donde reparar el flujo
+            raise ValueError("La arista lleva más flujo que la nueva capacidad; "
+                             "con varios orígenes o destinos vuelve a llamar a multi_flow")
+        self.capacity[e] = new_cap
+        if new_cap >= flow:
+            self.residual[e] = new_cap - flow
+            return
 
-    def edmonds_karp(self, source, sink):
+        # El flujo actual excede la nueva capacidad: se recorta y se repara
+        # el exceso que queda en u y el déficit que queda en v
+        excess = flow - new_cap
+        self.residual[e] = 0
+        self.residual[e ^ 1] -= excess
+        if u == v:
+            # Un lazo no mueve flujo entre nodos: basta con recortarlo
+            return
+        self._cancel_flow(u, v, excess)
+
+    def _push_path(self, s, t, limit):
+        head, residual = self.head, self.residual
+        parent = [-1] * self.ROW
+        pushed = 0
+        while pushed < limit and self.bfs(s, t, parent):
+            path_flow = limit - pushed
+            v = t
+            while v != s:
+                e = parent[v]
+                path_flow = min(path_flow, residual[e])
+                v = head[e ^ 1]
+            v = t
+            while v != s:
+                e = parent[v]
+                residual[e] -= path_flow
+                residual[e ^ 1] += path_flow
+                v = head[e ^ 1]
+            pushed += path_flow
+        return pushed
+
+    def _cancel_flow(self, u, v, excess):
+        # Primero se intenta desviar el exceso de u a v por otro camino
+        excess -= self._push_path(u, v, excess)
+        if not excess:
+            return
+        # Lo que no cabe se devuelve de u al origen y se retira del sumidero hacia v
+        if u != self.source:
+            self._push_path(u, self.source, excess)
+        if v != self.sink:
+            self._push_path(self.sink, v, excess)
+        self.flow_value -= excess
+
+    def resolve(self, algorithm=None, progress=None):
+        # Aumenta desde el flujo actual; el costo depende del tamaño del cambio
+        if self.source is None:
+            raise ValueError("Primero resuelve el grafo con max_flow")
+        self.max_flow(self.source, self.sink, algorithm or self.algorithm, progress, "off")
+        return self.flow_value
+
+    def iter_edges(self):
+        # Recorre solo las aristas reales (arcos pares): (u, v, capacidad, flujo)
+        head, residual, capacity = self.head, self.residual, self.capacity
+        for e in range(0, len(head), 2):
+            yield head[e + 1], head[e], capacity[e], capacity[e] - residual[e]
+
+    def _count_bfs(self, queue, processed):
+        self.stats.bfs_calls += 1
+        self._count_scan(queue, processed)
+
+    def _count_scan(self, queue, processed):
+        # Solo con estadísticas activas: los arcos explorados se cuentan al final
+        # para no agregar trabajo al ciclo interno de la BFS
+        stats = self.stats
+        stats.nodes_visited += processed
+        next_arc = self.next_arc
+        for k in range(processed):
+            e = self.first[queue[k]]
+            while e != -1:
+                stats.edges_scanned += 1
+                e = next_arc[e]
+
+    def bfs(self, s, t, parent, delta=1):
+        # parent[v] guarda el arco por el que se llegó a v; solo se usan arcos con
+        # residual >= delta (1 en Edmonds-Karp, el umbral de la fase al escalar)
+        head, next_arc, residual = self.head, self.next_arc, self.residual
+        visited = bytearray(self.ROW)
+        queue = [s]
+        visited[s] = 1
+
+        for u in queue:
+            e = self.first[u]
+            while e != -1:
+                v = head[e]
+                if not visited[v] and residual[e] >= delta:
+                    visited[v] = 1
+                    parent[v] = e
+                    if v == t:
+                        if self.stats is not None:
+                            self._count_bfs(queue, queue.index(u) + 1)
+                        return True
+                    queue.append(v)
+                e = next_arc[e]
+
+        if self.stats is not None:
+            self._count_bfs(queue, len(queue))
+        return False
+
+    def bidirectional_bfs(self, s, t, parent):
+        # BFS desde ambos extremos, expandiendo por niveles el frente más pequeño;
+        # termina en cuanto los frentes se tocan, con un camino igual de corto que el
+        # de bfs. child[v] es el arco de v hacia t, y al final se vuelca en parent.
+        if s == t:
+            return False
+        head, next_arc, residual, first = self.head, self.next_arc, self.residual, self.first
+        side = bytearray(self.ROW)  # 1: alcanzado desde s, 2: desde t
+        child = {}
+        forward = [s]
+        backward = [t]
+        side[s] = 1
+        side[t] = 2
+        frontier = [(0, 1), (0, 1)]  # [inicio, fin) del último nivel de cada búsqueda
+        meet = None
+
+        while meet is None:
+            (f_start, f_end), (b_start, b_end) = frontier
+            if f_start == f_end or b_start == b_end:
+                break
+            if f_end - f_start <= b_end - b_start:
+                for u in forward[f_start:f_end]:
+                    e = first[u]
+                    while e != -1:
+                        v = head[e]
+                        if side[v] != 1 and residual[e] > 0:
+                            parent[v] = e
+                            if side[v] == 2:
+                                meet = v
+                                break
+                            side[v] = 1
+                            forward.append(v)
+                        e = next_arc[e]
+                    if meet is not None:
+                        break
+                frontier[0] = (f_end, len(forward))
+            else:
+                for v in backward[b_start:b_end]:
+                    e = first[v]
+                    while e != -1:
+                        u = head[e]
+                        if side[u] != 2 and residual[e ^ 1] > 0:
+                            if side[u] == 1:
+                                parent[v] = e ^ 1
+                                meet = v
+                                break
+                            child[u] = e ^ 1
+                            side[u] = 2
+                            backward.append(u)
+                        e = next_arc[e]
+                    if meet is not None:
+                        break
+                frontier[1] = (b_end, len(backward))
+
+        if self.stats is not None:
+            self.stats.bfs_calls += 1
+            self._count_scan(forward, frontier[0][0])
+            self._count_scan(backward, frontier[1][0])
+        if meet is None:
+            return False
+        v = meet
+        while v != t:
+            e = child[v]
+            v = head[e]
+            parent[v] = e
+        return True
+
+    @_engine
+    def edmonds_karp(self, source, sink, progress=None, table=None):
+        return self._augment_paths(source, sink, progress, table,
+                                   lambda parent: self.bfs(source, sink, parent))
+
+    @_engine
+    def edmonds_karp_bidirectional(self, source, sink, progress=None, table=None):
+        return self._augment_paths(source, sink, progress, table,
+                                   lambda parent: self.bidirectional_bfs(source, sink, parent))
+
+    @_engine
+    def edmonds_karp_scaling(self, source, sink, progress=None, table=None):
+        # Escalamiento de capacidad: solo arcos con residual >= delta, que se reduce
+        # a la mitad cuando ya no hay camino; evita los aumentos diminutos
+        residual, next_arc = self.residual, self.next_arc
+        top = 0
+        e = self.first[source]
+        while e != -1:
+            top = max(top, residual[e])
+            e = next_arc[e]
+        delta = 1 << (top.bit_length() - 1) if top > 0 else 0
+
+        def find_path(parent):
+            nonlocal delta
+            while delta:
+                if self.bfs(source, sink, parent, delta):
+                    return True
+                delta >>= 1
+                if self.stats is not None:
+                    self.stats.phase()
+            return False
+
+        return self._augment_paths(source, sink, progress, table, find_path)
+
+    def _augment_paths(self, source, sink, progress, table, find_path):
+        # Ciclo común de los modos de Edmonds-Karp: find_path(parent) deja en parent
+        # un camino de source a sink y se aumenta por su cuello de botella
+        head, residual = self.head, self.residual
         parent = [-1] * self.ROW
         max_flow = 0
         iteration = 0
-        table = []
+        if table is None:
+            table = Trace()
+        stats = self.stats
+        timing = stats is not None and stats.timers is not None
+        if timing:
+            start = time.perf_counter()
 
-        while self.bfs(source, sink, parent):
+        while find_path(parent):
+            if timing:
+                found = time.perf_counter()
+                stats.add_time("bfs", found - start)
             iteration += 1
             path_flow = float("Inf")
             s = sink
-            path = []
+            path = [sink]
 
             while s != source:
-                path_flow = min(path_flow, self.graph[parent[s]][s])
-                path.append((parent[s], s))
-                s = parent[s]
+                e = parent[s]
+                path_flow = min(path_flow, residual[e])
+                s = head[e ^ 1]
+                path.append(s)
 
             v = sink
             while v != source:
-                u = parent[v]
-                self.graph[u][v] -= path_flow
-                self.graph[v][u] += path_flow
-                v = parent[v]
+                e = parent[v]
+                residual[e] -= path_flow
+                residual[e ^ 1] += path_flow
+                v = head[e ^ 1]
 
             max_flow += path_flow
             path.reverse()
-            table.append((iteration, path, path_flow, max_flow))
-            self.plot_graph(iteration, path, path_flow, max_flow, table)
+            table.record(path, path_flow, max_flow)
+            if stats is not None:
+                stats.augmented(len(path) - 1)
+                if timing:
+                    start = time.perf_counter()
+                    stats.add_time("augment", start - found)
+            if progress is not None:
+                progress(iteration, max_flow)
 
-        self.flag = True
-        self.plot_graph(iteration + 1, [], 0, max_flow, table)
+        if timing:
+            stats.add_time("bfs", time.perf_counter() - start)
         return max_flow, table
 
-    def plot_graph(self, iteration, path, path_flow, max_flow, table):
-        if self.fig is None:
-            self.fig = plt.figure(figsize=(14, 8))
-            self.fig.canvas.manager.window.wm_geometry("+{}+{}".format(self.fig_pos[0], self.fig_pos[1]))  # Establecer la posición de la ventana gráfica
-            self.gs = GridSpec(2, 1, height_ratios=[3, 1])
-            self.ax0 = plt.subplot(self.gs[0])
-            self.ax1 = plt.subplot(self.gs[1])
-            if not self.flag:
-                self.button = Button(plt.axes([0.5, 0.05, 0.1, 0.075]), 'Siguiente Iteration')
-            else:
-                self.button = Button(plt.axes([0.5, 0.05, 0.1, 0.075]), 'Terminar')
-            self.button.on_clicked(self.next_iteration)
+    def _levels(self, source, sink):
+        head, next_arc, residual, first = self.head, self.next_arc, self.residual, self.first
+        level = [-1] * self.ROW
+        level[source] = 0
+        queue = [source]
 
-        self.ax0.clear()
-        self.ax1.clear()
+        for processed, u in enumerate(queue):
+            if u == sink:
+                break
+            next_level = level[u] + 1
+            e = first[u]
+            while e != -1:
+                v = head[e]
+                if level[v] < 0 and residual[e] > 0:
+                    level[v] = next_level
+                    queue.append(v)
+                e = next_arc[e]
 
-        pos = nx.spring_layout(self.G)
+        if self.stats is not None:
+            self._count_bfs(queue, processed + (u != sink))
+        return level
 
-        # Dibujar aristas con capacidades
-        edge_labels = {(u, v): f"{self.original_graph[u][v] - self.graph[u][v]}/{self.original_graph[u][v]}" for u, v in self.G.edges}
-        if not self.flag:
-            nx.draw_networkx_edge_labels(self.G, pos, edge_labels=edge_labels, ax=self.ax0)
-        else:
-            nx.draw_networkx_edge_labels(self.G, pos, edge_labels=edge_labels, ax=self.ax0, font_color='blue', font_weight='bold', font_size= 12)
-        # Dibujar el grafo
-        nx.draw(self.G, pos, with_labels=True, node_size=700, node_color="lightblue", font_size=12, font_weight="bold", arrowsize=20, ax=self.ax0)
-        
-        # Resaltar el camino
-        path_edges = [(u, v) for u, v in path]
-        nx.draw_networkx_edges(self.G, pos, edgelist=path_edges, edge_color="red", width=2, ax=self.ax0)
-
-        if not self.flag:
-            self.ax0.set_title(f"Iteración {iteration}\nPath Flow: {path_flow}\nFlujo Total: {max_flow}")
+    @_engine
+    def dinic(self, source, sink, progress=None, table=None):
+        head, next_arc, residual = self.head, self.next_arc, self.residual
+        max_flow = 0
+        iteration = 0
+        if table is None:
+            table = Trace()
+        if source == sink:
+            return max_flow, table
+        stats = self.stats
+        timing = stats is not None and stats.timers is not None
+
+        while True:
+            if timing:
+                start = time.perf_counter()
+            level = self._levels(source, sink)
+            if timing:
+                stats.add_time("bfs", time.perf_counter() - start)
+            if level[sink] < 0:
+                break
+            if stats is not None:
+                stats.phase()
+                if timing:
+                    start = time.perf_counter()
+
+            # Flujo bloqueante con apuntadores al arco actual de cada nodo
+            current = array('i', self.first)
+            stack = []
+            u = source
+            while True:
+                if u == sink:
+                    iteration += 1
+                    path_flow = min(residual[e] for e in stack)
+                    for e in stack:
+                        residual[e] -= path_flow
+                        residual[e ^ 1] += path_flow
+                    max_flow += path_flow
+                    if table.keep_paths:
+                        table.record([source] + [head[e] for e in stack], path_flow, max_flow)
+                    else:
+                        table.record((), path_flow, max_flow)
+                    if stats is not None:
+                        stats.augmented(len(stack))
+                    if progress is not None:
+                        progress(iteration, max_flow)
+
+                    # Retroceder hasta la cola del primer arco saturado
+                    for k, e in enumerate(stack):
+                        if residual[e] == 0:
+                            del stack[k:]
+                            break
+                    u = head[stack[-1]] if stack else source
+                    continue
+
+                e = current[u]
+                next_level = level[u] + 1
+                while e != -1 and (residual[e] <= 0 or level[head[e]] != next_level):
+                    e = next_arc[e]
+                current[u] = e
+
+                if e == -1:
+                    # Nodo sin salida en el grafo de niveles: se descarta
+                    level[u] = -1
+                    if not stack:
+                        break
+                    e = stack.pop()
+                    u = head[e ^ 1]
+                    current[u] = next_arc[current[u]]
+                    continue
+
+                stack.append(e)
+                u = head[e]
+
+            if timing:
+                stats.add_time("blocking_flow", time.perf_counter() - start)
+
+        return max_flow, table
+
+    @_engine
+    def push_relabel(self, source, sink, progress=None, table=None):
+        # No hay caminos de aumento: la traza queda vacía
+        n = self.ROW
+        head, next_arc, residual, first = self.head, self.next_arc, self.residual, self.first
+        if table is None:
+            table = Trace()
+        if source == sink:
+            return 0, table
+
+        height = [0] * n
+        excess = [0] * n
+        count = [0] * (2 * n + 1)
+        buckets = [[] for _ in range(2 * n + 1)]
+        active = bytearray(n)
+        current = array('i', first)
+        highest = 0
+        stats = self.stats
+        timing = stats is not None and stats.timers is not None
+
+        def rebuild_buckets():
+            nonlocal highest
+            for bucket in buckets:
+                bucket.clear()
+            for i in range(len(count)):
+                count[i] = 0
+            highest = 0
+            for v in range(n):
+                count[height[v]] += 1
+                active[v] = 0
+                if excess[v] > 0 and v != source and v != sink:
+                    active[v] = 1
+                    buckets[height[v]].append(v)
+                    if height[v] > highest:
+                        highest = height[v]
+
+        def reverse_bfs(root, base, seen):
+            # Distancias hacia root en la red residual, desplazadas por base
+            height[root] = base
+            queue = [root]
+            for v in queue:
+                next_height = height[v] + 1
+                e = first[v]
+                while e != -1:
+                    w = head[e]
+                    if not seen[w] and residual[e ^ 1] > 0:
+                        seen[w] = 1
+                        height[w] = next_height
+                        queue.append(w)
+                    e = next_arc[e]
+            if stats is not None:
+                self._count_bfs(queue, len(queue))
+
+        def global_relabel():
+            if timing:
+                start = time.perf_counter()
+            seen = bytearray(n)
+            seen[sink] = 1
+            seen[source] = 1
+            reverse_bfs(sink, 0, seen)
+            reverse_bfs(source, n, seen)
+            for v in range(n):
+                if not seen[v]:
+                    height[v] = 2 * n
+            for v in range(n):
+                current[v] = first[v]
+            rebuild_buckets()
+            if stats is not None:
+                stats.phase()
+                if timing:
+                    stats.add_time("global_relabel", time.perf_counter() - start)
+
+        # Se saturan los arcos del origen, salvo sus lazos (u, u), que no llevan flujo
+        e = first[source]
+        while e != -1:
+            f = residual[e]
+            if f > 0 and head[e] != source:
+                residual[e] = 0
+                residual[e ^ 1] += f
+                excess[head[e]] += f
+                excess[source] -= f
+            e = next_arc[e]
+        global_relabel()
+
+        relabels = 0
+        discharges = 0
+        while True:
+            while highest > 0 and not buckets[highest]:
+                highest -= 1
+            if not buckets[highest]:
+                break
+            u = buckets[highest].pop()
+            active[u] = 0
+            discharges += 1
+            if progress is not None and not discharges & 1023:
+                progress(discharges, excess[sink])
+
+            # Descarga de u
+            while excess[u] > 0:
+                e = current[u]
+                if e == -1:
+                    old = height[u]
+                    new = 2 * n
+                    a = first[u]
+                    while a != -1:
+                        if residual[a] > 0 and height[head[a]] + 1 < new:
+                            new = height[head[a]] + 1
+                        a = next_arc[a]
+                    count[old] -= 1
+                    current[u] = first[u]
+                    relabels += 1
+                    if stats is not None:
+                        stats.relabels += 1
+
+                    if old < n and count[old] == 0:
+                        # Heurística de hueco: nadie por encima de old alcanza el sumidero
+                        if stats is not None:
+                            stats.gaps += 1
+                        for v in range(n):
+                            if old < height[v] < n or v == u:
+                                height[v] = max(height[v], n + 1)
+                                current[v] = first[v]
+                        rebuild_buckets()
+                        break
+
+                    height[u] = new
+                    count[new] += 1
+                    if relabels >= n:
+                        relabels = 0
+                        global_relabel()
+                        break
+                    continue
+
+                v = head[e]
+                if residual[e] > 0 and height[u] == height[v] + 1:
+                    delta = min(excess[u], residual[e])
+                    if stats is not None:
+                        stats.pushes += 1
+                    residual[e] -= delta
+                    residual[e ^ 1] += delta
+                    excess[u] -= delta
+                    excess[v] += delta
+                    if v != source and v != sink and not active[v]:
+                        active[v] = 1
+                        buckets[height[v]].append(v)
+                        if height[v] > highest:
+                            highest = height[v]
+                else:
+                    current[u] = next_arc[e]
+
+        return excess[sink], table
+
+    def max_flow(self, source, sink, algorithm="dinic", progress=None, trace="full", stats=None):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Algoritmo desconocido: {algorithm}")
+        self.stats = stats
+        if stats is not None:
+            stats.algorithm = algorithm
+            start = time.perf_counter()
+        try:
+            _, table = getattr(self, algorithm)(source, sink, progress, Trace(trace))
+        finally:
+            if stats is not None:
+                stats.seconds += time.perf_counter() - start
+            self.stats = None
+        # El motor aumenta desde el flujo actual; se devuelve siempre el flujo total
+        return self.flow_value, table
+
+    def solve(self, source, sink, algorithm="dinic", trace=False):
+        # Cálculo puro, sin matplotlib, networkx ni pandas; trace puede ser
+        # True/False o un nivel de TRACE_LEVELS
+        _, table = self.max_flow(source, sink, algorithm, trace=_trace_level(trace))
+        return FlowResult(self.flow_value, self.get_flows(), table if trace else None)
+
+    def multi_flow(self, sources, sinks, algorithm="dinic", lower=None, progress=None, stats=None):
+        # Varios orígenes y destinos en un solo cálculo. sources y sinks son nodos o
+        # diccionarios nodo -> oferta/demanda máxima (None sin límite); lower asigna
+        # a (u, v) el flujo mínimo de esa arista. Se resuelve sobre una copia con un
+        # superorigen n y un superdestino n + 1, y el flujo queda en este grafo.
+        n, arcs = self.ROW, len(self.head)
+        super_source, super_sink = n, n + 1
+        reduced = Graph(n + 4 if lower else n + 2)
+        reduced.first[:n] = array('i', self.first)
+        reduced.head = array('i', self.head)
+        reduced.next_arc = array('i', self.next_arc)
+        reduced.capacity = array('q', self.capacity)
+        unlimited = sum(self.capacity[e] for e in range(0, arcs, 2)) + 1
+
+        # Con cotas inferiores la arista lleva l de entrada y el resto (c - l) es libre;
+        # el desbalance que deja l en cada nodo se cubre con el par auxiliar n + 2, n + 3
+        bounds = {}
+        excess = {}
+        for (u, v), bound in (lower or {}).items():
+            e = self.find_edge(u, v)
+            if e is None:
+                raise ValueError(f"La arista ({u}, {v}) no existe")
+            if not 0 <= bound <= self.capacity[e]:
+                raise ValueError(f"Cota inferior inválida en ({u}, {v}): {bound}")
+            bounds[e] = bound
+            reduced.capacity[e] -= bound
+            excess[v] = excess.get(v, 0) + bound
+            excess[u] = excess.get(u, 0) - bound
+        reduced.residual = array('q', reduced.capacity)
+
+        for terminals, outgoing in ((sources, True), (sinks, False)):
+            limits = terminals.items() if isinstance(terminals, dict) else ((t, None) for t in terminals)
+            for node, limit in limits:
+                if not self.has_node(node):
+                    raise ValueError(f"El nodo {node} no aparece en el grafo")
+                limit = unlimited if limit is None else limit
+                if outgoing:
+                    reduced.add_edge(super_source, node, limit)
+                else:
+                    reduced.add_edge(node, super_sink, limit)
+
+        if lower:
+            # Primero un flujo factible: circulación con la arista de retorno sink -> source
+            back = len(reduced.head)
+            reduced.add_edge(super_sink, super_source, unlimited)
+            demand = 0
+            for node, balance in excess.items():
+                if balance > 0:
+                    reduced.add_edge(n + 2, node, balance)
+                    demand += balance
+                elif balance < 0:
+                    reduced.add_edge(node, n + 3, -balance)
+            feasible, _ = reduced.max_flow(n + 2, n + 3, algorithm, progress, "off", stats)
+            if feasible < demand:
+                raise ValueError("No existe un flujo que respete las cotas inferiores")
+            # Se retiran los arcos auxiliares y el flujo de retorno pasa a ser el inicial
+            initial = reduced.capacity[back] - reduced.residual[back]
+            for e in range(back, len(reduced.head)):
+                reduced.capacity[e] = reduced.residual[e] = 0
+            reduced.source, reduced.sink = super_source, super_sink
+            reduced.flow_value = initial
+
+        reduced.max_flow(super_source, super_sink, algorithm, progress, "off", stats)
+
+        # Flujo original = cota inferior + flujo en la copia reducida
+        residual, capacity = self.residual, self.capacity
+        for e in range(0, arcs, 2):
+            flow = bounds.get(e, 0) + reduced.capacity[e] - reduced.residual[e]
+            residual[e] = capacity[e] - flow
+            residual[e ^ 1] = capacity[e ^ 1] + flow
+        self.source = self.sink = None
+        self.algorithm = algorithm
+        self.flow_value = reduced.flow_value
+        return self.flow_value
+
+    def min_cost_flow(self, source, sink, algorithm="successive_shortest_paths", progress=None, stats=None):
+        # Flujo máximo de costo mínimo según los costos de add_edge; parte de flujo cero
+        if algorithm not in COST_ALGORITHMS:
+            raise ValueError(f"Algoritmo desconocido: {algorithm}")
+        self.reset()
+        self.source, self.sink = source, sink
+        self.stats = stats
+        if stats is not None:
+            stats.algorithm = algorithm
+            start = time.perf_counter()
+        try:
+            max_flow = getattr(self, algorithm)(source, sink, progress)
+        finally:
+            if stats is not None:
+                stats.seconds += time.perf_counter() - start
+            self.stats = None
+        self.flow_value = max_flow
+        # resolve repara el flujo máximo (no el costo) con un motor de flujo máximo
+        self.algorithm = "dinic"
+        return CostFlowResult(self.flow_cost(), max_flow, self.get_flows())
+
+    def _arc_costs(self):
+        if self.cost is None:
+            return array('q', [0]) * len(self.head)
+        return self.cost
+
+    def flow_cost(self):
+        if self.cost is None:
+            return 0
+        residual, capacity, cost = self.residual, self.capacity, self.cost
+        return sum((capacity[e] - residual[e]) * cost[e] for e in range(0, len(self.head), 2))
+
+    def _initial_potentials(self, cost):
+        # Johnson: Bellman-Ford (con cola) desde un nodo virtual unido a todos con
+        # costo 0; solo hace falta si hay costos negativos
+        n = self.ROW
+        head, next_arc, residual, first = self.head, self.next_arc, self.residual, self.first
+        potential = [0] * n
+        if all(cost[e] >= 0 for e in range(0, len(head), 2)):
+            return potential
+
+        # length[v] cuenta los arcos del camino más corto actual hasta v: un camino
+        # simple tiene a lo más n - 1, así que llegar a n implica un ciclo negativo
+        # (contar relajaciones fallaría con aristas paralelas)
+        length = [0] * n
+        queued = bytearray(b"\x01") * n
+        queue = deque(range(n))
+        while queue:
+            u = queue.popleft()
+            queued[u] = 0
+            e = first[u]
+            while e != -1:
+                v = head[e]
+                if residual[e] > 0 and potential[u] + cost[e] < potential[v]:
+                    potential[v] = potential[u] + cost[e]
+                    length[v] = length[u] + 1
+                    if length[v] >= n:
+                        raise ValueError("La red tiene un ciclo de costo negativo; usa cost_scaling")
+                    if not queued[v]:
+                        queued[v] = 1
+                        queue.append(v)
+                e = next_arc[e]
+        return potential
+
+    def successive_shortest_paths(self, source, sink, progress=None):
+        # Dijkstra sobre costos reducidos c(e) + p(u) - p(v); los potenciales de Johnson
+        # los mantienen no negativos después de cada aumento
+        n = self.ROW
+        head, next_arc, residual, first = self.head, self.next_arc, self.residual, self.first
+        cost = self._arc_costs()
+        potential = self._initial_potentials(cost)
+        stats = self.stats
+        max_flow = 0
+        iteration = 0
+        if source == sink:
+            return max_flow
+
+        while True:
+            distance = [None] * n
+            parent = [-1] * n
+            done = bytearray(n)
+            distance[source] = 0
+            heap = [(0, source)]
+            while heap:
+                d, u = heapq.heappop(heap)
+                if done[u]:
+                    continue
+                done[u] = 1
+                if u == sink:
+                    break
+                base = d + potential[u]
+                e = first[u]
+                while e != -1:
+                    if residual[e] > 0:
+                        v = head[e]
+                        candidate = base + cost[e] - potential[v]
+                        if not done[v] and (distance[v] is None or candidate < distance[v]):
+                            distance[v] = candidate
+                            parent[v] = e
+                            heapq.heappush(heap, (candidate, v))
+                    e = next_arc[e]
+            if not done[sink]:
+                break
+            if stats is not None:
+                stats.phase()
+
+            # Los nodos sin distancia definitiva avanzan lo mismo que el sumidero
+            limit = distance[sink]
+            for v in range(n):
+                potential[v] += distance[v] if done[v] else limit
+
+            path_flow = None
+            length = 0
+            v = sink
+            while v != source:
+                e = parent[v]
+                if path_flow is None or residual[e] < path_flow:
+                    path_flow = residual[e]
+                v = head[e ^ 1]
+                length += 1
+            v = sink
+            while v != source:
+                e = parent[v]
+                residual[e] -= path_flow
+                residual[e ^ 1] += path_flow
+                v = head[e ^ 1]
+
+            iteration += 1
+            max_flow += path_flow
+            if stats is not None:
+                stats.augmented(length)
+            if progress is not None:
+                progress(iteration, max_flow)
+
+        return max_flow
+
+    def cost_scaling(self, source, sink, progress=None):
+        # Primero el flujo máximo con Dinic; después se le quita costo con una
+        # circulación de costo mínimo en la red residual (refinamiento de
+        # Goldberg-Tarjan con ε decreciente). Los costos se multiplican por n + 1
+        # para que al terminar con ε = 1 el flujo sea óptimo.
+        max_flow, _ = self.dinic(source, sink, progress, Trace("off"))
+        scale = self.ROW + 1
+        cost = [c * scale for c in self._arc_costs()]
+        epsilon = max(map(abs, cost), default=0)
+        potential = [0] * self.ROW
+        while epsilon > 1:
+            epsilon = max(epsilon // 8, 1)
+            self._refine(cost, potential, epsilon)
+        return max_flow
+
+    def _refine(self, cost, potential, epsilon):
+        # Lleva el flujo de ε·8-óptimo a ε-óptimo: satura los arcos de costo reducido
+        # negativo y reparte los excesos por arcos admisibles (costo reducido < 0)
+        n = self.ROW
+        head, next_arc, residual, first = self.head, self.next_arc, self.residual, self.first
+        stats = self.stats
+        if stats is not None:
+            stats.phase()
+        excess = [0] * n
+        for u in range(n):
+            base = potential[u]
+            e = first[u]
+            while e != -1:
+                r = residual[e]
+                if r > 0 and cost[e] + base - potential[head[e]] < 0:
+                    residual[e] = 0
+                    residual[e ^ 1] += r
+                    excess[u] -= r
+                    excess[head[e]] += r
+                e = next_arc[e]
+
+        active = deque(v for v in range(n) if excess[v] > 0)
+        current = list(first)
+        while active:
+            u = active.popleft()
+            while excess[u] > 0:
+                e = current[u]
+                if e == -1:
+                    # Nuevo potencial: el mayor que deja un arco residual con costo reducido -ε
+                    best = None
+                    e = first[u]
+                    while e != -1:
+                        if residual[e] > 0:
+                            candidate = potential[head[e]] - cost[e]
+                            if best is None or candidate > best:
+                                best = candidate
+                        e = next_arc[e]
+                    potential[u] = best - epsilon
+                    current[u] = first[u]
+                    if stats is not None:
+                        stats.relabels += 1
+                    continue
+
+                v = head[e]
+                if residual[e] > 0 and cost[e] + potential[u] - potential[v] < 0:
+                    delta = min(excess[u], residual[e])
+                    residual[e] -= delta
+                    residual[e ^ 1] += delta
+                    excess[u] -= delta
+                    if excess[v] <= 0 < excess[v] + delta:
+                        active.append(v)
+                    excess[v] += delta
+                    if stats is not None:
+                        stats.pushes += 1
+                    if residual[e] == 0:
+                        current[u] = next_arc[e]
+                else:
+                    current[u] = next_arc[e]
+
+    def iter_flows(self):
+        # Flujo por arista real, sin pasar por ninguna estructura V x V
+        head, residual, capacity = self.head, self.residual, self.capacity
+        for e in range(0, len(head), 2):
+            if capacity[e] > 0:
+                yield head[e + 1], head[e], capacity[e] - residual[e]
+
+    def get_flows(self):
+        return list(self.iter_flows())
+
+    def min_cut(self, source=None):
+        # Una BFS sobre la red residual final: lo alcanzable desde el origen es el lado S.
+        # source hace falta si se llamó a un solver directamente en lugar de max_flow.
+        if source is None:
+            source = self.source
+        if source is None:
+            raise ValueError("Primero resuelve el grafo con max_flow")
+        head, next_arc, residual, capacity = self.head, self.next_arc, self.residual, self.capacity
+        visited = bytearray(self.ROW)
+        visited[source] = 1
+        side = [source]
+        for u in side:
+            e = self.first[u]
+            while e != -1:
+                v = head[e]
+                if not visited[v] and residual[e] > 0:
+                    visited[v] = 1
+                    side.append(v)
+                e = next_arc[e]
+
+        cut_edges = []
+        for u in side:
+            e = self.first[u]
+            while e != -1:
+                if not e & 1 and not visited[head[e]] and capacity[e] > 0:
+                    cut_edges.append((u, head[e], capacity[e]))
+                e = next_arc[e]
+        return set(side), cut_edges
+
+
+class DenseGraph:
+    # Motor denso opcional con matrices NumPy int64, para grafos pequeños y medianos
+    def __init__(self, vertices):
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("El motor denso requiere NumPy (pip install numpy)") from None
+        self.np = np
+        self.ROW = vertices
+        self.graph = np.zeros((vertices, vertices), dtype=np.int64)
+        self.original_graph = np.zeros((vertices, vertices), dtype=np.int64)
+        self.source = None
+        self.sink = None
+        self.algorithm = None
+        self.flow_value = 0
+        self.stats = None
+
+    def _grow(self, vertices):
+        # Crecimiento geométrico para no copiar la matriz en cada nodo nuevo
+        size = max(vertices, 2 * self.ROW)
+        pad = ((0, size - self.ROW), (0, size - self.ROW))
+        self.graph = self.np.pad(self.graph, pad)
+        self.original_graph = self.np.pad(self.original_graph, pad)
+        self.ROW = size
+
+    def add_edge(self, u, v, w, cost=0):
+        if cost:
+            raise ValueError("El motor denso no admite costos; usa Graph")
+        if u >= self.ROW or v >= self.ROW:
+            self._grow(max(u, v) + 1)
+        self.graph[u, v] += w
+        self.original_graph[u, v] += w
+
+    def has_node(self, u):
+        return 0 <= u < self.ROW
+
+    def reset(self):
+        self.graph = self.original_graph.copy()
+        self.flow_value = 0
+
+    def bfs(self, s, t, parent):
+        if self.stats is not None:
+            self.stats.bfs_calls += 1
+        np = self.np
+        visited = np.zeros(self.ROW, dtype=bool)
+        visited[s] = True
+        frontier = np.array([s])
+
+        # BFS por frentes completos con máscaras booleanas
+        while frontier.size:
+            if self.stats is not None:
+                self.stats.nodes_visited += frontier.size
+                self.stats.edges_scanned += frontier.size * self.ROW
+            reachable = self.graph[frontier] > 0
+            new = np.flatnonzero(reachable.any(axis=0) & ~visited)
+            if not new.size:
+                return False
+            parent[new] = frontier[reachable[:, new].argmax(axis=0)]
+            visited[new] = True
+            if visited[t]:
+                return True
+            frontier = new
+
+        return False
+
+    @_engine
+    def edmonds_karp(self, source, sink, progress=None, table=None):
+        np = self.np
+        parent = np.full(self.ROW, -1, dtype=np.int64)
+        max_flow = 0
+        iteration = 0
+        if table is None:
+            table = Trace()
+
+        while self.bfs(source, sink, parent):
+            iteration += 1
+            nodes = [sink]
+            while nodes[-1] != source:
+                nodes.append(int(parent[nodes[-1]]))
+            nodes.reverse()
+            us = np.array(nodes[:-1])
+            vs = np.array(nodes[1:])
+
+            path_flow = int(self.graph[us, vs].min())
+            self.graph[us, vs] -= path_flow
+            self.graph[vs, us] += path_flow
+
+            max_flow += path_flow
+            table.record(nodes, path_flow, max_flow)
+            if self.stats is not None:
+                self.stats.augmented(len(nodes) - 1)
+            if progress is not None:
+                progress(iteration, max_flow)
+
+        return max_flow, table
+
+    def max_flow(self, source, sink, algorithm="edmonds_karp", progress=None, trace="full", stats=None):
+        if algorithm != "edmonds_karp":
+            raise ValueError(f"El motor denso no soporta el algoritmo: {algorithm}")
+        self.stats = stats
+        if stats is not None:
+            stats.algorithm = "dense"
+            start = time.perf_counter()
+        try:
+            _, table = self.edmonds_karp(source, sink, progress, Trace(trace))
+        finally:
+            if stats is not None:
+                stats.seconds += time.perf_counter() - start
+            self.stats = None
+        # El motor aumenta desde el flujo actual; se devuelve siempre el flujo total
+        return self.flow_value, table
+
+    def solve(self, source, sink, algorithm="edmonds_karp", trace=False):
+        _, table = self.max_flow(source, sink, algorithm, trace=_trace_level(trace))
+        return FlowResult(self.flow_value, self.get_flows(), table if trace else None)
+
+    def iter_edges(self):
+        np = self.np
+        # Con aristas antiparalelas la matriz guarda el flujo neto; se recorta a cero
+        us, vs = np.nonzero(self.original_graph)
+        capacity = self.original_graph[us, vs]
+        flow = np.maximum(capacity - self.graph[us, vs], 0)
+        return zip(us.tolist(), vs.tolist(), capacity.tolist(), flow.tolist())
+
+    def iter_flows(self):
+        return ((u, v, flow) for u, v, cap, flow in self.iter_edges())
+
+    def get_flows(self):
+        return list(self.iter_flows())
+
+    def min_cut(self, source=None):
+        if source is None:
+            source = self.source
+        if source is None:
+            raise ValueError("Primero resuelve el grafo con max_flow")
+        np = self.np
+        visited = np.zeros(self.ROW, dtype=bool)
+        visited[source] = True
+        frontier = np.array([source])
+        while frontier.size:
+            new = np.flatnonzero((self.graph[frontier] > 0).any(axis=0) & ~visited)
+            visited[new] = True
+            frontier = new
+        side = np.flatnonzero(visited)
+        other = np.flatnonzero(~visited)
+        us, vs = np.nonzero(self.original_graph[np.ix_(side, other)])
+        cut_edges = [(u, v, int(self.original_graph[u, v])) for u, v in zip(side[us].tolist(), other[vs].tolist())]
+        return set(side.tolist()), cut_edges
+
+
+class NodeIndex:
+    # Asigna a cada etiqueta (cualquier valor hashable) un índice denso 0..n-1
+    def __init__(self):
+        self.ids = {}
+        self.labels = []
+
+    def intern(self, label):
+        index = self.ids.get(label)
+        if index is None:
+            index = len(self.labels)
+            self.ids[label] = index
+            self.labels.append(label)
+        return index
+
+    def __getitem__(self, label):
+        try:
+            return self.ids[label]
+        except KeyError:
+            raise ValueError(f"El nodo {label} no aparece en el grafo") from None
+
+    def __contains__(self, label):
+        return label in self.ids
+
+    def __len__(self):
+        return len(self.labels)
+
+
+class LabeledGraph:
+    # Grafo con nodos etiquetados; el almacenamiento crece con el número real de nodos
+    def __init__(self, engine=Graph):
+        self.nodes = NodeIndex()
+        self.graph = engine(0)
+
+    def has_node(self, label):
+        return label in self.nodes
+
+    def add_edge(self, u, v, w, cost=0):
+        self.graph.add_edge(self.nodes.intern(u), self.nodes.intern(v), w, cost)
+
+    def update_capacity(self, u, v, new_cap):
+        self.graph.update_capacity(self.nodes.intern(u), self.nodes.intern(v), new_cap)
+
+    def max_flow(self, source, sink, algorithm="dinic", progress=None, trace="full", stats=None):
+        max_flow, table = self.graph.max_flow(self.nodes[source], self.nodes[sink], algorithm, progress, trace, stats)
+        table.labels = self.nodes.labels
+        return max_flow, table
+
+    def resolve(self, algorithm=None, progress=None):
+        return self.graph.resolve(algorithm, progress)
+
+    def multi_flow(self, sources, sinks, algorithm="dinic", lower=None, progress=None, stats=None):
+        nodes = self.nodes
+
+        def ids(terminals):
+            if isinstance(terminals, dict):
+                return {nodes[label]: limit for label, limit in terminals.items()}
+            return [nodes[label] for label in terminals]
+
+        if lower:
+            lower = {(nodes[u], nodes[v]): bound for (u, v), bound in lower.items()}
+        return self.graph.multi_flow(ids(sources), ids(sinks), algorithm, lower, progress, stats)
+
+    def min_cost_flow(self, source, sink, algorithm="successive_shortest_paths", progress=None, stats=None):
+        result = self.graph.min_cost_flow(self.nodes[source], self.nodes[sink], algorithm, progress, stats)
+        return result._replace(flows=self.get_flows())
+
+    def solve(self, source, sink, algorithm="dinic", trace=False):
+        _, table = self.max_flow(source, sink, algorithm, trace=_trace_level(trace))
+        return FlowResult(self.graph.flow_value, self.get_flows(), table if trace else None)
+
+    def iter_edges(self):
+        labels = self.nodes.labels
+        for u, v, cap, flow in self.graph.iter_edges():
+            yield labels[u], labels[v], cap, flow
+
+    def iter_flows(self):
+        labels = self.nodes.labels
+        for u, v, flow in self.graph.iter_flows():
+            yield labels[u], labels[v], flow
+
+    def get_flows(self):
+        return list(self.iter_flows())
+
+    def min_cut(self, source=None):
+        labels = self.nodes.labels
+        side, cut_edges = self.graph.min_cut(None if source is None else self.nodes[source])
+        return {labels[u] for u in side}, [(labels[u], labels[v], cap) for u, v, cap in cut_edges]
+
+
+def _load_plotting():
+    global plt, nx, GridSpec, Button
+    if plt is None:
+        import matplotlib.pyplot as plt
+        import networkx as nx
+        from matplotlib.gridspec import GridSpec
+        from matplotlib.widgets import Button
+
+
+def layered_layout(G, source):
+    # Posiciones deterministas: una columna por distancia BFS desde el origen
+    level = {source: 0}
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        for v in G.successors(u):
+            if v not in level:
+                level[v] = level[u] + 1
+                queue.append(v)
+    last = max(level.values(), default=0) + 1
+    columns = {}
+    for node in G.nodes:
+        columns.setdefault(level.get(node, last), []).append(node)
+    pos = {}
+    for x, nodes in columns.items():
+        for i, node in enumerate(nodes):
+            pos[node] = (x, i - (len(nodes) - 1) / 2)
+    return pos
+
+
+# Posiciones calculadas por red (conjunto de aristas, disposición y origen). La
+# interfaz arma un grafo nuevo en cada cálculo, así que la llave no puede ser el
+# objeto: con la misma red los nodos quedan en el mismo lugar entre dibujos.
+_layouts = OrderedDict()
+LAYOUT_CACHE_SIZE = 16
+
+ROWS_SHOWN = 8  # Filas de la traza visibles en la tabla
+
+
+class GraphPlotter:
+    def __init__(self, graph, layout="spring", source=None, stats=None):
+        _load_plotting()
+        self.graph = graph
+        self.layout = layout
+        self.source = source
+        self.stats = stats  # con timers, acumula el tiempo de dibujo en "plot"
+        self.G = nx.DiGraph()
+        self.capacities = {}
+        self.flows = {}
+        for u, v, cap, flow in graph.iter_edges():
+            self.G.add_edge(u, v, capacity=cap)
+            self.capacities[(u, v)] = self.capacities.get((u, v), 0) + cap
+            self.flows[(u, v)] = 0
+        self.fig = None
+        self.gs = None
+        self.ax0 = None
+        self.ax1 = None
+        self.button = None
+        self.edge_artists = {}
+        self.label_artists = {}
+        self.cells = None
+        self.highlighted = []
+        self.rows = []
+        self.step = 0
+        self.max_flow = 0
+        self.current_iteration = 0
+        self.fig_pos = (100, 100)  # Posición deseada de la ventana gráfica
+
+    def graph_flows(self):
+        flows = {}
+        for u, v, cap, flow in self.graph.iter_edges():
+            flows[(u, v)] = flows.get((u, v), 0) + flow
+        return flows
+
+    def positions(self):
+        key = (frozenset(self.G.edges), self.layout, self.source)
+        pos = _layouts.get(key)
+        if pos is None:
+            if self.layout == "layered":
+                source = self.source if self.source is not None else next(iter(self.G.nodes))
+                pos = layered_layout(self.G, source)
+            else:
+                pos = nx.spring_layout(self.G, seed=0)
+            _layouts[key] = pos
+            while len(_layouts) > LAYOUT_CACHE_SIZE:
+                _layouts.popitem(last=False)
         else:
-            self.ax0.set_title(f"Resultado final\n\nFlujo Total: {max_flow}")
+            _layouts.move_to_end(key)
+        return pos
+
+    def _setup(self):
+        # Se dibuja todo una sola vez; cada iteración solo actualiza textos y colores
+        self.fig = plt.figure(figsize=(14, 8))
+        window = getattr(self.fig.canvas.manager, "window", None)
+        if hasattr(window, "wm_geometry"):
+            window.wm_geometry("+{}+{}".format(self.fig_pos[0], self.fig_pos[1]))  # Establecer la posición de la ventana gráfica
+        self.gs = GridSpec(2, 1, height_ratios=[3, 1])
+        self.ax0 = plt.subplot(self.gs[0])
+        self.ax1 = plt.subplot(self.gs[1])
+
+        pos = self.positions()
+        nx.draw_networkx_nodes(self.G, pos, node_size=700, node_color="lightblue", ax=self.ax0)
+        nx.draw_networkx_labels(self.G, pos, font_size=12, font_weight="bold", ax=self.ax0)
+        arrows = nx.draw_networkx_edges(self.G, pos, node_size=700, arrowsize=20, ax=self.ax0)
+        self.edge_artists = dict(zip(self.G.edges, arrows))
+        edge_labels = {(u, v): f"{self.flows[(u, v)]}/{self.capacities[(u, v)]}" for u, v in self.G.edges}
+        self.label_artists = nx.draw_networkx_edge_labels(self.G, pos, edge_labels=edge_labels, ax=self.ax0)
+        self.ax0.axis('off')
 
         # Tabla
         self.ax1.axis('tight')
         self.ax1.axis('off')
-
         col_labels = ['Iteración', 'Camino', 'Path Flow', 'Flujo Total']
-        table_data = [[iter, ' -> '.join(["1"] + [f"{v}" for u, v in path]), pf, tf] for iter, path, pf, tf in table]
-        table_df = pd.DataFrame(table_data, columns=col_labels)
-        
-        self.ax1.table(cellText=table_df.values, colLabels=col_labels, cellLoc='center', loc='center')
-        
-        if self.flag:
-            self.flag = False
+        table = self.ax1.table(cellText=[[""] * 4 for _ in range(ROWS_SHOWN)], colLabels=col_labels, cellLoc='center', loc='center')
+        self.cells = table.get_celld()
+
+        self.button = Button(plt.axes([0.5, 0.05, 0.1, 0.075]), 'Siguiente Iteration')
+        self.button.on_clicked(self.next_iteration)
+
+    def _edge(self, u, v):
+        return (u, v) if (u, v) in self.edge_artists else (v, u)
+
+    def _set_label(self, edge):
+        self.label_artists[edge].set_text(f"{self.flows[edge]}/{self.capacities[edge]}")
+
+    def _highlight(self, path):
+        for edge in self.highlighted:
+            self.edge_artists[edge].set_color("black")
+            self.edge_artists[edge].set_linewidth(1)
+        self.highlighted = [self._edge(u, v) for u, v in path]
+        for edge in self.highlighted:
+            self.edge_artists[edge].set_color("red")
+            self.edge_artists[edge].set_linewidth(2)
 
+    def _update_table(self):
+        # Ventana de las últimas filas hasta la iteración actual
+        end = min(self.step + 1, len(self.rows))
+        start = max(0, end - ROWS_SHOWN)
+        for i in range(ROWS_SHOWN):
+            values = [""] * 4
+            if start + i < end:
+                iter, path, pf, tf = self.rows[start + i]
+                camino = ' -> '.join([f"{path[0][0]}"] + [f"{v}" for u, v in path]) if path else ""
+                values = [iter, camino, pf, tf]
+            for j, value in enumerate(values):
+                self.cells[(i + 1, j)].get_text().set_text(f"{value}")
+
+    def plot_graph(self, iteration, path, path_flow, max_flow):
+        for u, v in path:
+            edge = self._edge(u, v)
+            if edge == (u, v) and self.flows[edge] + path_flow <= self.capacities[edge]:
+                self.flows[edge] += path_flow
+            else:
+                edge = (v, u)
+                self.flows[edge] -= path_flow
+            self._set_label(edge)
+        self._highlight(path)
+        self.ax0.set_title(f"Iteración {iteration}\nPath Flow: {path_flow}\nFlujo Total: {max_flow}")
+        self._update_table()
+
+    def _plot_result(self):
+        for edge, flow in self.graph_flows().items():
+            self.flows[edge] = flow
+        for edge, text in self.label_artists.items():
+            self._set_label(edge)
+            text.set_color('blue')
+            text.set_fontweight('bold')
+            text.set_fontsize(12)
+        # El corte mínimo (las aristas cuello de botella) queda resaltado
+        try:
+            _, cut_edges = self.graph.min_cut()
+        except ValueError:
+            cut_edges = []
+        self._highlight([(u, v) for u, v, cap in cut_edges])
+        self.ax0.set_title(f"Resultado final\n\nFlujo Total: {self.max_flow}")
+        self._update_table()
+        self.button.label.set_text('Terminar')
+
+    def _show_step(self):
+        timing = self.stats is not None and self.stats.timers is not None
+        if timing:
+            start = time.perf_counter()
+        if self.step < len(self.rows):
+            iteration, path, path_flow, total = self.rows[self.step]
+            self.plot_graph(iteration, path, path_flow, total)
+        else:
+            self._plot_result()
+        if timing:
+            self.stats.add_time("plot", time.perf_counter() - start)
+
+    def replay(self, max_flow, table, start=0):
+        # Reproduce la traza registrada por el solver en una sola ventana
+        self.max_flow = max_flow
+        self.rows = table
+        self.step = start
+        for edge in self.flows:
+            self.flows[edge] = 0
+        self._setup()
+        self._show_step()
         plt.show()
 
+    def show_result(self, max_flow, table):
+        self.replay(max_flow, table, start=len(table))
+
     def next_iteration(self, event):
+        if self.step >= len(self.rows):
+            plt.close(self.fig)
+            self.fig = None
+            self.gs = None
+            self.ax0 = None
+            self.ax1 = None
+            self.button = None
+            return
         self.current_iteration += 1
-        plt.close(self.fig)
-        self.fig = None
-        self.gs = None
-        self.ax0 = None
-        self.ax1 = None
-        self.button = None
+        self.step += 1
+        self._show_step()
+        self.fig.canvas.draw_idle()
 
-    def get_flows(self):
-        flows = []
-        for u in range(self.ROW):
-            for v in range(self.ROW):
-                if self.original_graph[u][v] > 0:
-                    actual_flow = self.original_graph[u][v] - self.graph[u][v]
-                    flows.append((u, v, actual_flow))
-        return flows
-    
 # g.add_edge(1, 2, 6)
 # g.add_edge(1, 3, 2)
 # g.add_edge(2, 3, 1)
@@ -0,0 +1,181 @@
+import csv
+import mmap
+import os
+import struct
+from array import array
+
+from FlujoMaximo import Graph, LabeledGraph
+
+FORMATS = ("csv", "txt", "dimacs", "binary")
+
+# Formato binario: cabecera y luego arreglos contiguos listos para el solver:
+# capacidad int64[arcos], first int32[nodos], head int32[arcos], next_arc int32[arcos].
+# El arco 2k es la arista k (ordenadas por nodo de origen, como en CSR) y 2k + 1 su reverso.
+BINARY_MAGIC = b"FLUJOMX\0"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<8sIIqq")
+
+
+def parse_label(text):
+    # Los identificadores numéricos se guardan como enteros y el resto como texto.
+    # Solo si el número se escribe igual de vuelta: "0012" sigue siendo un código
+    # de estación distinto de "12".
+    text = text.strip()
+    try:
+        value = int(text)
+    except ValueError:
+        return text
+    return value if str(value) == text else text
+
+
+def detect_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".max", ".dimacs", ".dmx"):
+        return "dimacs"
+    if extension == ".fmx":
+        return "binary"
+    return "txt"
+
+
+def read_csv(stream, graph, node=int):
+    # Columnas: origen, destino, capacidad y costo opcional. Se ignora una cabecera no numérica.
+    header = True
+    for row in csv.reader(stream):
+        if not row or row[0].lstrip().startswith("#"):
+            continue
+        try:
+            graph.add_edge(node(row[0]), node(row[1]), int(row[2]), *map(int, row[3:4]))
+        except ValueError:
+            if not header:
+                raise
+        header = False
+    return None, None
+
+
+def read_txt(stream, graph, node=int):
+    # Una arista por línea: "origen destino capacidad [costo]"
+    for line in stream:
+        fields = line.split()
+        if not fields or fields[0].startswith("#"):
+            continue
+        graph.add_edge(node(fields[0]), node(fields[1]), int(fields[2]), *map(int, fields[3:4]))
+    return None, None
+
+
+def read_dimacs(stream, graph, node=int):
+    source = sink = None
+    for line in stream:
+        fields = line.split()
+        if not fields:
+            continue
+        kind = fields[0]
+        if kind == "a":
+            graph.add_edge(node(fields[1]), node(fields[2]), int(fields[3]))
+        elif kind == "n":
+            if fields[2] == "s":
+                source = node(fields[1])
+            elif fields[2] == "t":
+                sink = node(fields[1])
+        elif kind == "p":
+            if fields[1] != "max":
+                raise ValueError(f"Problema DIMACS no soportado: {fields[1]}")
+            # Los nodos DIMACS van de 1 a n
+            vertices = int(fields[2]) + 1
+            # Solo los motores numéricos reservan nodos; LabeledGraph y otros destinos
+            # de aristas los crean al vuelo
+            if hasattr(graph, "_grow") and vertices > graph.ROW:
+                graph._grow(vertices)
+        elif kind != "c":
+            raise ValueError(f"Línea DIMACS no reconocida: {line.rstrip()}")
+    return source, sink
+
+
+READERS = {"csv": read_csv, "txt": read_txt, "dimacs": read_dimacs}
+
+
+def read_graph(stream, fmt, graph=None):
+    # Las aristas se pasan directamente al grafo conforme se leen las líneas.
+    # Con un LabeledGraph los nodos de CSV y texto pueden ser cualquier etiqueta.
+    if graph is None:
+        graph = Graph(0)
+    node = parse_label if isinstance(graph, LabeledGraph) else int
+    source, sink = READERS[fmt](stream, graph, node)
+    return graph, source, sink
+
+
+def write_flows(stream, max_flow, graph, flows=True, cut=False, cost=None):
+    # Formato de solución DIMACS: "s valor" y una línea "f u v flujo" por arista;
+    # el corte mínimo se agrega como líneas "m u v capacidad" y el costo total,
+    # si lo hay, como comentario "c costo total"
+    stream.write(f"s {max_flow}\n")
+    if cost is not None:
+        stream.write(f"c costo {cost}\n")
+    if flows:
+        for u, v, flow in graph.iter_flows():
+            stream.write(f"f {u} {v} {flow}\n")
+    if cut:
+        for u, v, cap in graph.min_cut()[1]:
+            stream.write(f"m {u} {v} {cap}\n")
+
+
+def write_binary(path, graph):
+    # Reordena las aristas por nodo de origen (ordenamiento por conteo, sin listas
+    # de Python por arista) y escribe los arreglos del solver tal cual
+    n = graph.ROW
+    head, capacity = graph.head, graph.capacity
+    edges = len(head) // 2
+    offset = array('q', [0]) * (n + 1)
+    for k in range(edges):
+        offset[head[2 * k + 1] + 1] += 1
+    for u in range(n):
+        offset[u + 1] += offset[u]
+
+    new_head = array('i', [0]) * (2 * edges)
+    new_capacity = array('q', [0]) * (2 * edges)
+    for k in range(edges):
+        p = offset[head[2 * k + 1]]
+        offset[head[2 * k + 1]] = p + 1
+        new_head[2 * p] = head[2 * k]
+        new_head[2 * p + 1] = head[2 * k + 1]
+        new_capacity[2 * p] = capacity[2 * k]
+        new_capacity[2 * p + 1] = capacity[2 * k + 1]
+
+    # Listas de adyacencia en orden creciente de arco
+    first = array('i', [-1]) * n
+    next_arc = array('i', [-1]) * (2 * edges)
+    for e in range(2 * edges - 1, -1, -1):
+        u = new_head[e ^ 1]
+        next_arc[e] = first[u]
+        first[u] = e
+
+    with open(path, "wb") as stream:
+        stream.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, first.itemsize, n, 2 * edges))
+        for a in (new_capacity, first, new_head, next_arc):
+            a.tofile(stream)
+
+
+def load_binary(path):
+    # Mapea el archivo en memoria: la estructura se comparte entre procesos y las
+    # capacidades residuales usan copia en escritura, sin objetos por arista
+    with open(path, "rb") as stream:
+        shared = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        private = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_COPY)
+    magic, version, index_size, vertices, arcs = BINARY_HEADER.unpack_from(shared)
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise ValueError(f"{path} no es un archivo de grafo binario válido")
+    if index_size != array('i').itemsize:
+        raise ValueError(f"{path} usa índices de {index_size} bytes")
+
+    view = memoryview(shared)
+    start = BINARY_HEADER.size
+    capacity = view[start:start + 8 * arcs].cast('q')
+    residual = memoryview(private)[start:start + 8 * arcs].cast('q')
+    start += 8 * arcs
+    first = view[start:start + index_size * vertices].cast('i')
+    start += index_size * vertices
+    head = view[start:start + index_size * arcs].cast('i')
+    start += index_size * arcs
+    next_arc = view[start:start + index_size * arcs].cast('i')
+    return Graph.from_arrays(first, head, next_arc, capacity, residual)
@@ -0,0 +1,94 @@
+import random
+
+# Cada generador regresa (vértices, aristas, origen, destino) con aristas (u, v, capacidad)
+
+
+def random_sparse(n, m, max_cap=100, seed=0):
+    rng = random.Random(seed)
+    edges = []
+    while len(edges) < m:
+        u = rng.randrange(n)
+        v = rng.randrange(n)
+        if u != v:
+            edges.append((u, v, rng.randint(1, max_cap)))
+    return n, edges, 0, n - 1
+
+
+def grid(rows, cols, max_cap=100, seed=0):
+    # Rejilla con el origen unido a la primera columna y la última columna al destino
+    rng = random.Random(seed)
+    source = rows * cols
+    sink = source + 1
+    edges = []
+    for r in range(rows):
+        for c in range(cols):
+            u = r * cols + c
+            if c + 1 < cols:
+                edges.append((u, u + 1, rng.randint(1, max_cap)))
+            if r + 1 < rows:
+                edges.append((u, u + cols, rng.randint(1, max_cap)))
+                edges.append((u + cols, u, rng.randint(1, max_cap)))
+        edges.append((source, r * cols, max_cap * cols))
+        edges.append((r * cols + cols - 1, sink, max_cap * cols))
+    return rows * cols + 2, edges, source, sink
+
+
+def layered(layers, width, degree=3, max_cap=100, seed=0):
+    rng = random.Random(seed)
+    source = layers * width
+    sink = source + 1
+    edges = []
+    for i in range(width):
+        edges.append((source, i, max_cap * degree))
+        edges.append(((layers - 1) * width + i, sink, max_cap * degree))
+    for layer in range(layers - 1):
+        for i in range(width):
+            u = layer * width + i
+            for v in rng.sample(range(width), min(degree, width)):
+                edges.append((u, (layer + 1) * width + v, rng.randint(1, max_cap)))
+    return layers * width + 2, edges, source, sink
+
+
+def bipartite_matching(left, right, degree=3, seed=0):
+    # Capacidades unitarias: el flujo máximo es el emparejamiento máximo
+    rng = random.Random(seed)
+    source = left + right
+    sink = source + 1
+    edges = [(source, i, 1) for i in range(left)]
+    for i in range(left):
+        for j in rng.sample(range(right), min(degree, right)):
+            edges.append((i, left + j, 1))
+    edges.extend((left + j, sink, 1) for j in range(right))
+    return left + right + 2, edges, source, sink
+
+
+def ak_network(k):
+    # Red al estilo AK: una cadena que obliga a k aumentos cada vez más largos y
+    # k caminos paralelos de longitudes 1..k, cada uno con su propio aumento
+    source, sink = 0, 1
+    edges = []
+    n = 2
+    previous = source
+    for i in range(k):
+        node = n
+        n += 1
+        edges.append((previous, node, k - i))
+        edges.append((node, sink, 1))
+        previous = node
+    for length in range(1, k + 1):
+        previous = source
+        for _ in range(length):
+            edges.append((previous, n, 1))
+            previous = n
+            n += 1
+        edges.append((previous, sink, 1))
+    return n, edges, source, sink
+
+
+GENERATORS = {
+    "random_sparse": random_sparse,
+    "grid": grid,
+    "layered": layered,
+    "bipartite": bipartite_matching,
+    "ak": ak_network,
+}
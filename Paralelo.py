@@ -0,0 +1,88 @@
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import Formatos
+from FlujoMaximo import Graph
+
+JobResult = namedtuple("JobResult", ["max_flow", "flows", "seconds"])
+
+_base = None
+_shared = None
+
+
+def _run(graph, source, sink, algorithm, flows):
+    start = time.perf_counter()
+    max_flow, _ = graph.max_flow(source, sink, algorithm, trace="off")
+    result_flows = graph.get_flows() if flows else None
+    return JobResult(max_flow, result_flows, time.perf_counter() - start)
+
+
+def _solve_job(job):
+    graph, source, sink, algorithm, flows = job
+    return _run(graph, source, sink, algorithm, flows)
+
+
+def solve_many(jobs, algorithm="dinic", workers=None, flows=True):
+    # Cada trabajo (grafo, origen, destino) se envía completo a un proceso
+    tasks = ((graph, source, sink, algorithm, flows) for graph, source, sink in jobs)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_solve_job, tasks))
+
+
+def _share_graph(graph):
+    # Copia los arreglos del grafo base a un solo bloque de memoria compartida
+    arrays = (graph.capacity, graph.first, graph.head, graph.next_arc)
+    size = sum(len(a) * a.itemsize for a in arrays)
+    shm = SharedMemory(create=True, size=max(size, 1))
+    offset = 0
+    for a in arrays:
+        nbytes = len(a) * a.itemsize
+        shm.buf[offset:offset + nbytes] = memoryview(a).cast('B')
+        offset += nbytes
+    return shm, (shm.name, graph.ROW, len(graph.head))
+
+
+def _attach_graph(name, vertices, arcs):
+    global _base, _shared
+    _shared = SharedMemory(name=name)
+    buf = _shared.buf
+    capacity = buf[:8 * arcs].cast('q')
+    offset = 8 * arcs
+    first = buf[offset:offset + 4 * vertices].cast('i')
+    offset += 4 * vertices
+    head = buf[offset:offset + 4 * arcs].cast('i')
+    offset += 4 * arcs
+    next_arc = buf[offset:offset + 4 * arcs].cast('i')
+    _base = Graph.from_arrays(first, head, next_arc, capacity)
+
+
+def _load_graph(path):
+    # Cada trabajador mapea el mismo archivo binario; las páginas se comparten
+    global _base
+    _base = Formatos.load_binary(path)
+
+
+def _solve_pair(job):
+    source, sink, algorithm, flows = job
+    _base.reset()
+    return _run(_base, source, sink, algorithm, flows)
+
+
+def solve_pairs(graph, pairs, algorithm="dinic", workers=None, flows=True, chunksize=16):
+    # Varias consultas (origen, destino) sobre un mismo grafo base, que los
+    # trabajadores reciben una sola vez por memoria compartida. graph también
+    # puede ser la ruta de un archivo binario de Formatos.write_binary.
+    tasks = ((source, sink, algorithm, flows) for source, sink in pairs)
+    if isinstance(graph, str):
+        with ProcessPoolExecutor(max_workers=workers, initializer=_load_graph, initargs=(graph,)) as pool:
+            return list(pool.map(_solve_pair, tasks, chunksize=chunksize))
+
+    shm, layout = _share_graph(graph)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_graph, initargs=layout) as pool:
+            return list(pool.map(_solve_pair, tasks, chunksize=chunksize))
+    finally:
+        shm.close()
+        shm.unlink()
@@ -0,0 +1,386 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from CacheResultados import fingerprint
+from FlujoMaximo import ALGORITHMS, LabeledGraph
+
+# Servidor HTTP local con JSON para otros servicios:
+#   POST /graphs   {"edges": [[u, v, capacidad], ...]}  ->  {"graph": huella}
+#                  (se recuerdan los últimos REGISTERED_GRAPHS; si no, responde 404)
+#   POST /solve    {"graph": huella | "edges": [...], "queries": [[s, t], ...],
+#                   "algorithm": "dinic", "flows": false}
+#                  ->  NDJSON por fragmentos, una línea por consulta en cuanto termina
+#   GET  /metrics  ->  contadores, latencias y rendimiento
+# Los cálculos corren en un pool de procesos; el ciclo de eventos solo lee y escribe.
+
+MAX_BODY = 1 << 28
+MAX_BATCH = 64
+GRAPH_CACHE_SIZE = 8
+REGISTERED_GRAPHS = 64  # grafos que recuerda POST /graphs; el menos usado se olvida
+STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+          500: "Internal Server Error"}
+
+_graphs = OrderedDict()  # grafos ya construidos en cada proceso trabajador, por huella
+
+
+def _worker_graph(graph_id, edges):
+    g = _graphs.get(graph_id)
+    if g is None:
+        if edges is None:
+            return None
+        g = LabeledGraph()
+        for u, v, w in edges:
+            g.add_edge(u, v, w)
+        _graphs[graph_id] = g
+        while len(_graphs) > GRAPH_CACHE_SIZE:
+            _graphs.popitem(last=False)
+    else:
+        _graphs.move_to_end(graph_id)
+    return g
+
+
+def _solve_batch(graph_id, edges, pairs, algorithm, flows):
+    # Se ejecuta en un trabajador: un grafo, varias consultas. El lote puede mezclar
+    # consultas de varios clientes, así que el error de una no debe tumbar a las demás.
+    # Sin edges solo sirve el grafo ya construido; si falta se devuelve None y el
+    # lote se reenvía con las aristas.
+    g = _worker_graph(graph_id, edges)
+    if g is None:
+        return None
+    results = []
+    for source, sink in pairs:
+        start = time.perf_counter()
+        try:
+            g.max_flow(source, sink, algorithm, trace="off")
+        except Exception as error:
+            results.append({"error": str(error)})
+            continue
+        result = {"max_flow": g.graph.flow_value, "seconds": time.perf_counter() - start}
+        if flows:
+            result["flows"] = g.get_flows()
+        results.append(result)
+    return results
+
+
+def _ready():
+    return True
+
+
+def _label(value):
+    # Los nodos son texto o enteros; listas u objetos JSON no sirven como etiqueta
+    if isinstance(value, bool) or not isinstance(value, (str, int)):
+        raise ValueError(f"Etiqueta de nodo inválida: {value!r}")
+    return value
+
+
+def _capacity(value):
+    # Capacidades enteras no negativas; no se truncan decimales en silencio
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError(f"Capacidad inválida: {value!r}")
+    return value
+
+
+def _parse_graph(edges):
+    # Fuera del ciclo de eventos: valida las aristas y calcula la huella
+    edges = [(_label(u), _label(v), _capacity(w)) for u, v, w in edges]
+    return edges, fingerprint(edges)
+
+
+class Metrics:
+    def __init__(self, window=4096):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.queries = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_queries = 0
+        self.graph_uploads = 0  # lotes que tuvieron que enviar las aristas a un trabajador
+        self.in_flight = 0
+        self.latencies = deque(maxlen=window)  # segundos desde que llegó la petición
+        self.completed = deque(maxlen=window)  # instante en que terminó cada consulta
+
+    def record(self, latency):
+        self.queries += 1
+        self.latencies.append(latency)
+        self.completed.append(time.monotonic())
+
+    def snapshot(self):
+        now = time.monotonic()
+        uptime = now - self.started
+        ordered = sorted(self.latencies)
+
+        def percentile(p):
+            if not ordered:
+                return None
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+        recent = sum(1 for t in self.completed if now - t <= 10)
+        return {
+            "uptime_seconds": uptime,
+            "requests": self.requests,
+            "queries": self.queries,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "batches": self.batches,
+            "average_batch": self.batched_queries / self.batches if self.batches else 0.0,
+            "graph_uploads": self.graph_uploads,
+            "latency_seconds": {"p50": percentile(0.5), "p90": percentile(0.9),
+                                "p99": percentile(0.99), "max": ordered[-1] if ordered else None},
+            "throughput": {"total": self.queries / uptime if uptime else 0.0, "last_10s": recent / 10},
+        }
+
+
+class Batcher:
+    # Junta las consultas que llegan dentro de la misma ventana sobre el mismo grafo
+    # y las reparte en a lo más un trabajo por proceso. Cada trabajo viaja solo con
+    # la huella; las aristas se envían únicamente al trabajador que aún no tiene el
+    # grafo, así que se serializan y construyen una vez por trabajador
+    def __init__(self, pool, workers, metrics, window=0.002):
+        self.pool = pool
+        self.workers = workers
+        self.metrics = metrics
+        self.window = window
+        self.pending = {}  # (huella, algoritmo, flujos) -> (aristas, [(par, futuro)])
+
+    def submit(self, graph_id, edges, pair, algorithm, flows):
+        loop = asyncio.get_running_loop()
+        key = (graph_id, algorithm, flows)
+        batch = self.pending.get(key)
+        if batch is None:
+            batch = self.pending[key] = (edges, [])
+            loop.call_later(self.window, self.flush, key)
+        future = loop.create_future()
+        batch[1].append((pair, future))
+        if len(batch[1]) >= MAX_BATCH:
+            self.flush(key)
+        return future
+
+    def flush(self, key):
+        batch = self.pending.pop(key, None)
+        if batch is None:
+            return  # ya se envió por tamaño antes de que venciera la ventana
+        edges, queries = batch
+        self.metrics.batches += 1
+        self.metrics.batched_queries += len(queries)
+        size = -(-len(queries) // self.workers)
+        for start in range(0, len(queries), size):
+            self._run(key, edges, queries[start:start + size])
+
+    def _run(self, key, edges, queries, upload=False):
+        loop = asyncio.get_running_loop()
+        job = loop.run_in_executor(self.pool, _solve_batch, key[0], edges if upload else None,
+                                   [pair for pair, _ in queries], key[1], key[2])
+        job.add_done_callback(lambda done: self._deliver(key, edges, queries, done))
+
+    def _deliver(self, key, edges, queries, job):
+        error = job.exception()
+        if error is None and job.result() is None:
+            # El trabajador no tenía el grafo: se repite el lote con las aristas
+            self.metrics.graph_uploads += 1
+            self._run(key, edges, queries, upload=True)
+            return
+        for k, (_, future) in enumerate(queries):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_result({"error": str(error)})
+            else:
+                future.set_result(job.result()[k])
+
+
+class FlowServer:
+    def __init__(self, workers=None, window=0.002):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.metrics = Metrics()
+        self.batcher = Batcher(self.pool, self.workers, self.metrics, window)
+        self.graphs = OrderedDict()  # grafos registrados con POST /graphs, por huella
+
+    async def start(self):
+        # Los trabajadores se crean antes de aceptar conexiones: con fork heredarían
+        # los sockets abiertos y el cliente no vería nunca el cierre de la respuesta
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _ready) for _ in range(self.workers)))
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    async def handle(self, reader, writer):
+        arrived = time.perf_counter()
+        try:
+            request = await _read_request(reader)
+            if request is None:
+                return
+            self.metrics.requests += 1
+            method, path, body = request
+            if path == "/metrics" and method == "GET":
+                _send_json(writer, 200, self.metrics.snapshot())
+            elif path == "/graphs" and method == "POST":
+                await self.register(body, writer)
+            elif path == "/solve" and method == "POST":
+                await self.solve(body, writer, arrived)
+            elif path in ("/metrics", "/graphs", "/solve"):
+                _send_json(writer, 405, {"error": f"Método no permitido: {method}"})
+            else:
+                _send_json(writer, 404, {"error": f"Ruta desconocida: {path}"})
+            await writer.drain()
+        except _HTTPError as error:
+            self.metrics.errors += 1
+            _send_json(writer, error.status, {"error": error.message})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.metrics.errors += 1
+        except Exception as error:
+            # Un fallo imprevisto no debe dejar al cliente sin respuesta
+            self.metrics.errors += 1
+            _send_json(writer, 500, {"error": f"Error interno: {error}"})
+        finally:
+            writer.close()
+
+    async def _load(self, body):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, json.loads, body)
+        except ValueError as error:
+            raise _HTTPError(400, f"JSON inválido: {error}")
+
+    async def _graph(self, request):
+        loop = asyncio.get_running_loop()
+        if "graph" in request:
+            if not isinstance(request["graph"], str):
+                raise _HTTPError(400, "'graph' debe ser la huella que devolvió POST /graphs")
+            edges = self.graphs.get(request["graph"])
+            if edges is None:
+                raise _HTTPError(404, f"Grafo desconocido: {request['graph']}")
+            self.graphs.move_to_end(request["graph"])
+            return edges, request["graph"]
+        try:
+            return await loop.run_in_executor(None, _parse_graph, request["edges"])
+        except (KeyError, TypeError, ValueError):
+            raise _HTTPError(400, "Se esperaba 'graph' o 'edges' como [[origen, destino, capacidad], ...] "
+                                  "con capacidades enteras no negativas")
+
+    async def register(self, body, writer):
+        request = await self._load(body)
+        if not isinstance(request, dict):
+            raise _HTTPError(400, "Se esperaba un objeto JSON")
+        edges, graph_id = await self._graph(request)
+        self.graphs[graph_id] = edges
+        self.graphs.move_to_end(graph_id)
+        while len(self.graphs) > REGISTERED_GRAPHS:
+            self.graphs.popitem(last=False)
+        _send_json(writer, 200, {"graph": graph_id, "edges": len(edges)})
+
+    async def solve(self, body, writer, arrived):
+        request = await self._load(body)
+        if not isinstance(request, dict):
+            raise _HTTPError(400, "Se esperaba un objeto JSON")
+        algorithm = request.get("algorithm", "dinic")
+        if algorithm not in ALGORITHMS:
+            raise _HTTPError(400, f"Algoritmo desconocido: {algorithm}")
+        try:
+            pairs = [(_label(source), _label(sink)) for source, sink in request["queries"]]
+        except (KeyError, TypeError, ValueError):
+            raise _HTTPError(400, "Se esperaba 'queries' como [[origen, destino], ...] con etiquetas de texto o enteras")
+        edges, graph_id = await self._graph(request)
+        flows = bool(request.get("flows", False))
+
+        async def answer(k, pair, future):
+            result = await future
+            return dict(result, query=k, source=pair[0], sink=pair[1])
+
+        pending = [answer(k, pair, self.batcher.submit(graph_id, edges, pair, algorithm, flows))
+                   for k, pair in enumerate(pairs)]
+        remaining = len(pending)
+        self.metrics.in_flight += remaining
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        try:
+            for next_result in asyncio.as_completed(pending):
+                result = await next_result
+                remaining -= 1
+                self.metrics.in_flight -= 1
+                if "error" in result:
+                    self.metrics.errors += 1
+                self.metrics.record(time.perf_counter() - arrived)
+                line = (json.dumps(result) + "\n").encode()
+                writer.write(f"{len(line):x}\r\n".encode() + line + b"\r\n")
+                await writer.drain()
+            writer.write(b"0\r\n\r\n")
+        finally:
+            # Si el cliente se desconecta, lo que faltaba ya no cuenta como en curso
+            self.metrics.in_flight -= remaining
+
+
+class _HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+async def _read_request(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise _HTTPError(400, "Línea de petición inválida")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise _HTTPError(400, "Content-Length inválido")
+    if length > MAX_BODY:
+        raise _HTTPError(413, f"El cuerpo supera {MAX_BODY} bytes")
+    body = await reader.readexactly(length) if length else b""
+    return method, target.split("?", 1)[0], body
+
+
+def _send_json(writer, status, payload):
+    body = json.dumps(payload).encode()
+    writer.write(f"HTTP/1.1 {status} {STATUS[status]}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+
+
+async def serve(host="127.0.0.1", port=8080, workers=None, window=0.002):
+    app = FlowServer(workers, window)
+    await app.start()
+    server = await asyncio.start_server(app.handle, host, port)
+    print(f"Escuchando en http://{host}:{port}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        app.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servidor local de flujo máximo (HTTP + JSON).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("-w", "--workers", type=int, help="procesos del pool (por omisión, uno por CPU)")
+    parser.add_argument("--window", type=float, default=2.0,
+                        help="milisegundos que se esperan para juntar consultas del mismo grafo")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.window / 1000))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
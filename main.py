@@ -1,6 +1,144 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-from FlujoMaximo import Graph
+import argparse
+import io
+import queue
+import sys
+import threading
+import time
+from FlujoMaximo import ALGORITHMS, COST_ALGORITHMS, DenseGraph, Graph, GraphPlotter, LabeledGraph, SolveCancelled, SolverStats
+import Formatos
+
+# Tk se importa al abrir la interfaz (ver _load_tk): la línea de comandos y
+# EdgeStore funcionan en equipos sin Tk, como los trabajos nocturnos
+tk = None
+ttk = None
+filedialog = None
+messagebox = None
+
+EDGE_COLUMNS = ('Nodo Origen', 'Nodo Destino', 'Peso')
+
+
+def _load_tk():
+    global tk, ttk, filedialog, messagebox
+    if tk is None:
+        import tkinter as tk
+        from tkinter import ttk, filedialog, messagebox
+
+
+class EdgeStore:
+    # Aristas de la interfaz en una lista compacta más un índice (origen, destino) -> fila.
+    # Quitar una arista mueve la última a su lugar, así borrar y detectar repetidas es O(1).
+    def __init__(self):
+        self.rows = []
+        self.index = {}
+        self.degree = {}  # aristas que tocan cada nodo, para saber si sigue en el grafo
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, position):
+        return self.rows[position]
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __contains__(self, pair):
+        return pair in self.index
+
+    def has_node(self, label):
+        return label in self.degree
+
+    def add_edge(self, u, v, w, cost=0):
+        # Misma interfaz que los grafos para usar los lectores de Formatos (la tabla no
+        # usa costos); una arista repetida suma su capacidad, igual que aristas paralelas
+        position = self.index.get((u, v))
+        if position is not None:
+            self.rows[position] = (u, v, self.rows[position][2] + w)
+            return False
+        self.index[(u, v)] = len(self.rows)
+        self.rows.append((u, v, w))
+        self.degree[u] = self.degree.get(u, 0) + 1
+        self.degree[v] = self.degree.get(v, 0) + 1
+        return True
+
+    def remove(self, position):
+        u, v, w = self.rows[position]
+        last = self.rows.pop()
+        del self.index[(u, v)]
+        if position < len(self.rows):
+            self.rows[position] = last
+            self.index[last[:2]] = position
+        for node in (u, v):
+            self.degree[node] -= 1
+            if not self.degree[node]:
+                del self.degree[node]
+        return u, v, w
+
+
+class EdgeTable:
+    # Treeview con un número fijo de filas: solo se materializan las visibles y la
+    # barra de desplazamiento recorre el EdgeStore por posición
+    def __init__(self, master, store, height=10):
+        self.store = store
+        self.height = height
+        self.offset = 0
+        self.selected = None  # posición en el EdgeStore de la fila seleccionada
+
+        self.frame = tk.Frame(master)
+        self.tree = ttk.Treeview(self.frame, columns=EDGE_COLUMNS, show='headings', height=height, selectmode='browse')
+        for column in EDGE_COLUMNS:
+            self.tree.heading(column, text=column)
+        self.tree.grid(row=0, column=0)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.items = [self.tree.insert('', 'end', values=()) for _ in range(height)]
+
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda event: self.scroll(-1))
+        self.tree.bind("<Button-5>", lambda event: self.scroll(1))
+
+    def grid(self, **options):
+        self.frame.grid(**options)
+
+    def yview(self, *args):
+        # Protocolo de la barra: ("moveto", fracción) o ("scroll", n, "units" | "pages")
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.store)))
+        elif args[0] == "scroll":
+            step = self.height if args[2] == "pages" else 1
+            self.scroll_to(self.offset + int(args[1]) * step)
+
+    def scroll(self, units):
+        self.scroll_to(self.offset + 3 * units)
+        return "break"
+
+    def scroll_to(self, first):
+        self.offset = first
+        self.refresh()
+
+    def refresh(self):
+        total = len(self.store)
+        self.offset = max(0, min(self.offset, total - self.height))
+        for k, item in enumerate(self.items):
+            position = self.offset + k
+            self.tree.item(item, values=self.store[position] if position < total else ())
+
+        if self.selected is not None and self.offset <= self.selected < self.offset + self.height:
+            self.tree.selection_set(self.items[self.selected - self.offset])
+        else:
+            self.tree.selection_remove(*self.tree.selection())
+
+        if total > self.height:
+            self.scrollbar.set(self.offset / total, (self.offset + self.height) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def on_select(self, event):
+        selection = self.tree.selection()
+        if not selection:
+            return
+        position = self.offset + self.items.index(selection[0])
+        self.selected = position if position < len(self.store) else None
 
 
 class MaxFlowGUI:
@@ -11,8 +149,7 @@ class MaxFlowGUI:
         self.intro_label = tk.Label(master, text="Por favor ingresa los datos del problema:")
         self.intro_label.grid(row=0, column=0, columnspan=2)
 
-        self.nodes = set()
-        self.edges = []
+        self.edges = EdgeStore()
 
         self.node_label = tk.Label(master, text="Nodo Origen:")
         self.node_label.grid(row=1, column=0)
@@ -38,27 +175,61 @@ class MaxFlowGUI:
         self.remove_edge_button = tk.Button(master, text="Quitar Arista", command=self.remove_edge)
         self.remove_edge_button.grid(row=4, column=1)
 
-        self.treeview = ttk.Treeview(master, columns=('Nodo Origen', 'Nodo Destino', 'Peso'), show='headings')
-        self.treeview.grid(row=5, column=0, columnspan=2)
+        self.import_button = tk.Button(master, text="Importar Archivo", command=self.import_file)
+        self.import_button.grid(row=5, column=0)
+
+        self.paste_button = tk.Button(master, text="Pegar Aristas", command=self.paste_edges)
+        self.paste_button.grid(row=5, column=1)
 
-        self.treeview.heading('Nodo Origen', text='Nodo Origen')
-        self.treeview.heading('Nodo Destino', text='Nodo Destino')
-        self.treeview.heading('Peso', text='Peso')
+        self.table = EdgeTable(master, self.edges)
+        self.table.grid(row=6, column=0, columnspan=2)
 
         self.origin_label = tk.Label(master, text="Nodo Origen del Problema:")
-        self.origin_label.grid(row=6, column=0)
+        self.origin_label.grid(row=7, column=0)
 
         self.origin_entry = tk.Entry(master)
-        self.origin_entry.grid(row=6, column=1)
+        self.origin_entry.grid(row=7, column=1)
 
         self.destination_label = tk.Label(master, text="Nodo Destino del Problema:")
-        self.destination_label.grid(row=7, column=0)
+        self.destination_label.grid(row=8, column=0)
 
         self.destination_entry = tk.Entry(master)
-        self.destination_entry.grid(row=7, column=1)
+        self.destination_entry.grid(row=8, column=1)
+
+        self.algorithm_label = tk.Label(master, text="Algoritmo:")
+        self.algorithm_label.grid(row=9, column=0)
+
+        self.algorithm_combo = ttk.Combobox(master, values=ALGORITHMS, state="readonly")
+        self.algorithm_combo.set("edmonds_karp")
+        self.algorithm_combo.grid(row=9, column=1)
+
+        self.layout_label = tk.Label(master, text="Disposición:")
+        self.layout_label.grid(row=10, column=0)
+
+        self.layout_combo = ttk.Combobox(master, values=("spring", "layered"), state="readonly")
+        self.layout_combo.set("spring")
+        self.layout_combo.grid(row=10, column=1)
 
         self.solve_button = tk.Button(master, text="Resolver", command=self.solve_max_flow)
-        self.solve_button.grid(row=8, column=0, columnspan=2)
+        self.solve_button.grid(row=11, column=0)
+
+        self.cancel_button = tk.Button(master, text="Cancelar", command=self.cancel_solve, state=tk.DISABLED)
+        self.cancel_button.grid(row=11, column=1)
+
+        self.status_label = tk.Label(master, text="")
+        self.status_label.grid(row=12, column=0, columnspan=2)
+
+        self.stats_label = tk.Label(master, text="", justify=tk.LEFT)
+        self.stats_label.grid(row=13, column=0, columnspan=2)
+
+        self.export_button = tk.Button(master, text="Exportar estadísticas", command=self.export_stats, state=tk.DISABLED)
+        self.export_button.grid(row=14, column=0, columnspan=2)
+        self.stats = None
+
+        # Comunicación con el hilo que resuelve el problema
+        self.solve_queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.solver_thread = None
 
     def add_edge(self):
         node = self.node_entry.get()
@@ -69,36 +240,78 @@ class MaxFlowGUI:
             messagebox.showwarning("Advertencia", "Por favor ingresa todos los campos.")
             return
 
-        if not node.isdigit() or not dest.isdigit() or not weight.isdigit():
-            messagebox.showwarning("Advertencia", "Los nodos y el peso deben ser números enteros.")
+        if not weight.isdigit():
+            messagebox.showwarning("Advertencia", "El peso debe ser un número entero.")
             return
 
-        edge = (int(node), int(dest), int(weight))
-        self.edges.append(edge)
-
-        self.nodes.add(int(node))
-        self.nodes.add(int(dest))
-
-        self.treeview.insert('', 'end', values=edge)
+        u, v = Formatos.parse_label(node), Formatos.parse_label(dest)
+        if (u, v) in self.edges:
+            messagebox.showwarning("Advertencia", f"La arista ({node}, {dest}) ya existe.")
+            return
 
-        messagebox.showinfo("Arista Agregada", f"Arista ({node}, {dest}) con peso {weight} agregada correctamente.")
+        self.edges.add_edge(u, v, int(weight))
+        self.table.scroll_to(len(self.edges))
+        self.status_label.config(text=f"Arista ({node}, {dest}) con peso {weight} agregada · {len(self.edges)} aristas")
 
         self.node_entry.delete(0, tk.END)
         self.dest_entry.delete(0, tk.END)
         self.weight_entry.delete(0, tk.END)
 
     def remove_edge(self):
-        selected_item = self.treeview.selection()
-        if not selected_item:
+        position = self.table.selected
+        if position is None:
             messagebox.showwarning("Advertencia", "Por favor selecciona una arista para quitar.")
             return
 
-        item = self.treeview.item(selected_item)
-        edge = item['values']
-        self.treeview.delete(selected_item)
-        self.edges.remove(tuple(edge))
-        
-        messagebox.showinfo("Arista Quitada", f"Arista {edge} eliminada correctamente.")
+        edge = self.edges.remove(position)
+        self.table.selected = None
+        self.table.refresh()
+        self.status_label.config(text=f"Arista {edge} eliminada · {len(self.edges)} aristas")
+
+    def import_edges(self, stream, fmt):
+        # Se lee todo en un almacén aparte y se agrega de una vez: si el archivo tiene
+        # un error no queda a medio importar, y la tabla se redibuja una sola vez
+        batch = EdgeStore()
+        try:
+            source, sink = Formatos.READERS[fmt](stream, batch, Formatos.parse_label)
+        except (ValueError, IndexError) as error:
+            messagebox.showerror("Error", f"No se pudieron leer las aristas: {error}")
+            return
+
+        added = sum(self.edges.add_edge(u, v, w) for u, v, w in batch)
+        self.table.refresh()
+        for entry, node in ((self.origin_entry, source), (self.destination_entry, sink)):
+            if node is not None and not entry.get():
+                entry.insert(0, str(node))
+        merged = len(batch) - added
+        self.status_label.config(text=f"{added} aristas agregadas, {merged} repetidas combinadas · {len(self.edges)} aristas")
+
+    def import_file(self):
+        path = filedialog.askopenfilename(filetypes=[("Aristas", "*.csv *.txt *.max *.dimacs *.dmx"), ("Todos", "*")])
+        if not path:
+            return
+        fmt = Formatos.detect_format(path)
+        if fmt == "binary":
+            messagebox.showwarning("Advertencia", "El formato binario solo se usa desde la línea de comandos.")
+            return
+        with open(path, newline="") as stream:
+            self.import_edges(stream, fmt)
+
+    def paste_edges(self):
+        try:
+            text = self.master.clipboard_get()
+        except tk.TclError:
+            messagebox.showwarning("Advertencia", "El portapapeles está vacío.")
+            return
+        # Líneas "a u v c" son DIMACS, con comas CSV y si no "origen destino peso"
+        lines = text.lstrip().splitlines()
+        if lines and lines[0].split()[0] in ("a", "c", "p", "n"):
+            fmt = "dimacs"
+        elif "," in text:
+            fmt = "csv"
+        else:
+            fmt = "txt"
+        self.import_edges(io.StringIO(text), fmt)
 
     def solve_max_flow(self):
         if not self.edges:
@@ -112,24 +325,200 @@ class MaxFlowGUI:
             messagebox.showwarning("Advertencia", "Por favor ingresa el nodo origen y destino del problema.")
             return
 
-        if not origin.isdigit() or not destination.isdigit():
-            messagebox.showwarning("Advertencia", "Los nodos origen y destino deben ser números enteros.")
+        source = Formatos.parse_label(origin)
+        sink = Formatos.parse_label(destination)
+        if not self.edges.has_node(source) or not self.edges.has_node(sink):
+            messagebox.showwarning("Advertencia", "Los nodos origen y destino deben aparecer en alguna arista.")
             return
 
-        vertices = len(self.nodes) + 1
-        g = Graph(vertices)
-        for edge in self.edges:
-            g.add_edge(int(edge[0]), int(edge[1]), int(edge[2]))
-        source = int(origin)
-        sink = int(destination)
+        if self.solver_thread is not None:
+            return
 
-        _ , _ = g.edmonds_karp(source, sink)
+        g = LabeledGraph()
+        for u, v, w in self.edges:
+            g.add_edge(u, v, w)
+
+        self.cancel_event.clear()
+        self.solve_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.status_label.config(text="Resolviendo...")
+        self.stats_label.config(text="")
+        self.export_button.config(state=tk.DISABLED)
+        self.solver_thread = threading.Thread(target=self.run_solver, args=(g, source, sink, self.algorithm_combo.get()), daemon=True)
+        self.solver_thread.start()
+        self.master.after(100, self.poll_solver)
         # messagebox.showinfo("Datos Recolectados", f"Nodos: {self.nodes}\nAristas: {self.edges}\nNodo Origen del Problema: {origin}\nNodo Destino del Problema: {destination}")
 
+    def run_solver(self, g, source, sink, algorithm):
+        # Se ejecuta fuera del hilo de Tk; solo se comunica a través de la cola
+        start = time.perf_counter()
+        last_report = start
+
+        def progress(iteration, flow):
+            nonlocal last_report
+            if self.cancel_event.is_set():
+                raise SolveCancelled()
+            now = time.perf_counter()
+            if now - last_report >= 0.1:
+                last_report = now
+                self.solve_queue.put(("progress", iteration, flow, now - start))
+
+        stats = SolverStats(timers=True)
+        try:
+            max_flow, table = g.max_flow(source, sink, algorithm, progress, stats=stats)
+        except SolveCancelled:
+            self.solve_queue.put(("cancelled", time.perf_counter() - start))
+        except Exception as error:
+            self.solve_queue.put(("error", error))
+        else:
+            self.solve_queue.put(("done", g, source, max_flow, table, stats, time.perf_counter() - start))
+
+    def poll_solver(self):
+        while True:
+            try:
+                message = self.solve_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            kind = message[0]
+            if kind == "progress":
+                _, iteration, flow, elapsed = message
+                self.status_label.config(text=f"Iteración {iteration} · Flujo actual {flow} · {elapsed:.1f} s")
+                continue
+
+            self.solver_thread = None
+            self.solve_button.config(state=tk.NORMAL)
+            self.cancel_button.config(state=tk.DISABLED)
+            if kind == "cancelled":
+                self.status_label.config(text=f"Cálculo cancelado tras {message[1]:.1f} s")
+            elif kind == "error":
+                self.status_label.config(text="")
+                messagebox.showerror("Error", f"No se pudo resolver el problema: {message[1]}")
+            else:
+                _, g, source, max_flow, table, stats, elapsed = message
+                self.status_label.config(text=f"Flujo máximo {max_flow} en {elapsed:.2f} s")
+                self.show_stats(stats)
+                GraphPlotter(g, self.layout_combo.get(), source, stats).replay(max_flow, table)
+            return
+
+        self.master.after(100, self.poll_solver)
+
+    def show_stats(self, stats):
+        self.stats = stats
+        phases = " · ".join(f"{phase}: {seconds * 1000:.1f} ms" for phase, seconds in stats.timers.items())
+        self.stats_label.config(text=stats.summary() + ("\n" + phases if phases else ""))
+        self.export_button.config(state=tk.NORMAL)
+
+    def export_stats(self):
+        path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        with open(path, "w") as stream:
+            stream.write(self.stats.to_json(indent=2))
+
+    def cancel_solve(self):
+        self.cancel_event.set()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.status_label.config(text="Cancelando...")
+
 def main():
+    _load_tk()
     root = tk.Tk()
     app = MaxFlowGUI(root)
     root.mainloop()
 
+def cli(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve el problema de flujo máximo sin interfaz gráfica.")
+    parser.add_argument("input", help="archivo de aristas (CSV, texto, DIMACS o binario); '-' para la entrada estándar")
+    parser.add_argument("-f", "--format", choices=("auto",) + Formatos.FORMATS, default="auto")
+    parser.add_argument("-s", "--source", type=Formatos.parse_label, action="append",
+                        help="nodo origen (obligatorio salvo en DIMACS); se puede repetir")
+    parser.add_argument("-t", "--sink", type=Formatos.parse_label, action="append",
+                        help="nodo destino (obligatorio salvo en DIMACS); se puede repetir")
+    parser.add_argument("-a", "--algorithm", choices=ALGORITHMS, default="dinic")
+    parser.add_argument("-b", "--backend", choices=("sparse", "dense"), default="sparse",
+                        help="motor de cálculo; 'dense' usa matrices NumPy y solo edmonds_karp")
+    parser.add_argument("-o", "--output", help="archivo de salida (por defecto la salida estándar)")
+    parser.add_argument("--no-flows", action="store_true", help="escribir solo el valor del flujo máximo")
+    parser.add_argument("--min-cut", action="store_true", help="agregar las aristas del corte mínimo (líneas 'm')")
+    parser.add_argument("--min-cost", choices=COST_ALGORITHMS, metavar="ALGORITMO",
+                        help="flujo máximo de costo mínimo con los costos de la cuarta columna "
+                             f"({', '.join(COST_ALGORITHMS)})")
+    parser.add_argument("--stats", metavar="ARCHIVO",
+                        help="escribir contadores y tiempos por fase en JSON ('-' para stderr)")
+    parser.add_argument("--save-binary", metavar="ARCHIVO",
+                        help="guardar el grafo en formato binario mapeable (solo entradas DIMACS)")
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt == "auto":
+        fmt = "txt" if args.input == "-" else Formatos.detect_format(args.input)
+
+    engine = Graph
+    if args.backend == "dense":
+        if args.algorithm != "edmonds_karp":
+            parser.error("el motor denso solo soporta --algorithm edmonds_karp")
+        engine = DenseGraph
+    # DIMACS numera los nodos 1..n; en CSV y texto los nodos son etiquetas arbitrarias
+    g = engine(0) if fmt == "dimacs" else LabeledGraph(engine)
+
+    if fmt == "binary":
+        if args.input == "-" or engine is not Graph:
+            parser.error("el formato binario se lee de un archivo y con el motor disperso")
+        g, source, sink = Formatos.load_binary(args.input), None, None
+    elif args.input == "-":
+        g, source, sink = Formatos.read_graph(sys.stdin, fmt, g)
+    else:
+        with open(args.input, newline="") as stream:
+            g, source, sink = Formatos.read_graph(stream, fmt, g)
+
+    if args.save_binary:
+        if type(g) is not Graph:
+            parser.error("--save-binary requiere una entrada DIMACS y el motor disperso")
+        Formatos.write_binary(args.save_binary, g)
+
+    sources = args.source or ([source] if source is not None else [])
+    sinks = args.sink or ([sink] if sink is not None else [])
+    if not sources or not sinks:
+        if args.save_binary:
+            return 0
+        parser.error("indica el nodo origen y destino con --source y --sink")
+    if not isinstance(g, LabeledGraph) and not all(isinstance(node, int) for node in sources + sinks):
+        # DIMACS y binario usan el motor numérico directamente: los nodos son enteros
+        parser.error("en DIMACS y binario el origen y el destino son números de nodo")
+    if not all(g.has_node(node) for node in sources + sinks):
+        parser.error("el nodo origen o destino no aparece en el grafo")
+
+    stats = SolverStats(timers=True) if args.stats else None
+    cost = None
+    if args.min_cost:
+        if args.backend == "dense" or len(sources) > 1 or len(sinks) > 1:
+            parser.error("--min-cost requiere el motor disperso, un origen y un destino")
+        cost, max_flow, _ = g.min_cost_flow(sources[0], sinks[0], args.min_cost, stats=stats)
+    elif len(sources) == 1 and len(sinks) == 1:
+        max_flow, _ = g.max_flow(sources[0], sinks[0], args.algorithm, trace="off", stats=stats)
+    else:
+        # Varios orígenes o destinos: un solo cálculo con superorigen y superdestino
+        if args.backend == "dense":
+            parser.error("varios orígenes o destinos requieren el motor disperso")
+        if args.min_cut:
+            parser.error("--min-cut solo se admite con un origen y un destino")
+        max_flow = g.multi_flow(sources, sinks, args.algorithm, stats=stats)
+
+    if args.output:
+        with open(args.output, "w") as stream:
+            Formatos.write_flows(stream, max_flow, g, not args.no_flows, args.min_cut, cost)
+    else:
+        Formatos.write_flows(sys.stdout, max_flow, g, not args.no_flows, args.min_cut, cost)
+
+    if args.stats == "-":
+        print(stats.to_json(), file=sys.stderr)
+    elif args.stats:
+        with open(args.stats, "w") as stream:
+            stream.write(stats.to_json(indent=2))
+    return 0
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(cli())
     main()
@@ -0,0 +1,56 @@
+from CacheResultados import ResultCache, fingerprint
+
+EDGES = [("a", "b", 3), ("b", "c", 2), ("a", "c", 1)]
+
+
+def test_hits_cannot_be_mutated(tmp_path):
+    cache = ResultCache(path=str(tmp_path / "cache.db"))
+    first = cache.solve(EDGES, "a", "c")
+    assert first.max_flow == 3
+    assert isinstance(first.flows, tuple)
+    assert isinstance(first.source_side, frozenset)
+    assert isinstance(first.cut_edges, tuple)
+
+    cache.entries.clear()  # el siguiente acierto viene de SQLite
+    second = cache.solve(EDGES, "a", "c")
+    assert second == first
+    assert isinstance(second.source_side, frozenset)
+    cache.close()
+
+
+def test_fingerprint_ignores_order_but_not_content():
+    shuffled = [EDGES[2], list(EDGES[0]), EDGES[1]]
+    assert fingerprint(shuffled) == fingerprint(EDGES)
+    assert fingerprint(EDGES + [("a", "c", 0)]) != fingerprint(EDGES)
+    assert fingerprint([("a", "b", 3)]) != fingerprint([("a", "b", 4)])
+    assert fingerprint([("0012", "b", 3)]) != fingerprint([(12, "b", 3)])
+    assert fingerprint([("a\nb", "c", 1)]) != fingerprint([("a", "b", 1), ("c", "d", 1)])
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(maxsize=2)
+    cache.solve(EDGES, "a", "c")
+    cache.solve(EDGES, "a", "b")
+    cache.solve(EDGES, "a", "c")  # acierto: ("a", "b") queda como el más antiguo
+    cache.solve(EDGES, "b", "c")
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert len(cache.entries) == 2
+    cache.solve(EDGES, "a", "c")
+    assert cache.hits == 2
+    cache.solve(EDGES, "a", "b")
+    assert cache.misses == 4
+
+
+def test_invalidate_drops_only_that_network(tmp_path):
+    cache = ResultCache(path=str(tmp_path / "cache.db"))
+    other = [("a", "c", 7)]
+    cache.solve(EDGES, "a", "c")
+    cache.solve(other, "a", "c")
+    cache.invalidate(EDGES)
+    assert len(cache.entries) == 1
+    assert cache.solve(other, "a", "c").max_flow == 7
+    assert cache.hits == 1
+    cache.entries.clear()
+    cache.solve(EDGES, "a", "c")  # tampoco queda en SQLite
+    assert cache.misses == 3
+    cache.close()
@@ -0,0 +1,112 @@
+import random
+
+import pytest
+
+from FlujoMaximo import COST_ALGORITHMS, Graph
+
+
+def build(n, edges):
+    g = Graph(n)
+    for u, v, w, c in edges:
+        g.add_edge(u, v, w, c)
+    return g
+
+
+def cycle_canceling(n, edges, source, sink):
+    # Referencia: flujo máximo y luego cancelación de ciclos negativos con Bellman-Ford
+    g = build(n, edges)
+    g.max_flow(source, sink, "dinic", trace="off")
+    cost = g._arc_costs()
+    while True:
+        distance = [0] * n
+        parent = [-1] * n
+        last = -1
+        for _ in range(n):
+            last = -1
+            for e in range(len(g.head)):
+                u, v = g.head[e ^ 1], g.head[e]
+                if g.residual[e] > 0 and distance[u] + cost[e] < distance[v]:
+                    distance[v] = distance[u] + cost[e]
+                    parent[v] = e
+                    last = v
+        if last == -1:
+            return g.flow_cost(), g.flow_value
+        for _ in range(n):
+            last = g.head[parent[last] ^ 1]
+        cycle = []
+        v = last
+        while True:
+            cycle.append(parent[v])
+            v = g.head[parent[v] ^ 1]
+            if v == last:
+                break
+        delta = min(g.residual[e] for e in cycle)
+        for e in cycle:
+            g.residual[e] -= delta
+            g.residual[e ^ 1] += delta
+
+
+@pytest.mark.parametrize("algorithm", COST_ALGORITHMS)
+def test_negative_costs_on_parallel_arcs(algorithm):
+    g = Graph(2)
+    g.add_edge(0, 1, 1, -3)
+    g.add_edge(0, 1, 1, -2)
+    g.add_edge(0, 1, 1, -1)
+    result = g.min_cost_flow(0, 1, algorithm)
+    assert (result.cost, result.max_flow) == (-6, 3)
+
+
+@pytest.mark.parametrize("algorithm", COST_ALGORITHMS)
+def test_resolve_after_min_cost_flow(algorithm):
+    g = build(4, [(0, 1, 2, 1), (1, 3, 2, 1), (0, 2, 1, 5), (2, 3, 1, 5)])
+    assert g.min_cost_flow(0, 3, algorithm).max_flow == 3
+    g.update_capacity(0, 2, 4)
+    g.update_capacity(2, 3, 4)
+    assert g.resolve() == 6
+    g.update_capacity(1, 3, 0)
+    assert g.resolve() == 4
+
+
+def test_negative_cycle_is_reported():
+    g = Graph(3)
+    g.add_edge(0, 1, 1, 1)
+    g.add_edge(1, 2, 1, -2)
+    g.add_edge(2, 1, 1, -2)
+    with pytest.raises(ValueError):
+        g.min_cost_flow(0, 2, "successive_shortest_paths")
+    assert g.min_cost_flow(0, 2, "cost_scaling").cost == -1
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_random_negative_dags(seed):
+    # Aristas de nodos menores a mayores (sin ciclos), con paralelas y costos negativos
+    rng = random.Random(seed)
+    n = rng.randint(3, 10)
+    edges = []
+    for _ in range(3 * n):
+        u, v = sorted(rng.sample(range(n), 2))
+        edges.append((u, v, rng.randint(0, 8), rng.randint(-10, 10)))
+    expected = cycle_canceling(n, edges, 0, n - 1)
+    for algorithm in COST_ALGORITHMS:
+        result = build(n, edges).min_cost_flow(0, n - 1, algorithm)
+        assert (result.cost, result.max_flow) == expected
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_random_against_cycle_canceling(seed):
+    rng = random.Random(seed)
+    n = rng.randint(3, 12)
+    edges = [(rng.randrange(n), rng.randrange(n), rng.randint(0, 10), rng.randint(0, 20))
+             for _ in range(3 * n)]
+    edges = [e for e in edges if e[0] != e[1]]
+    expected = cycle_canceling(n, edges, 0, n - 1)
+    for algorithm in COST_ALGORITHMS:
+        g = build(n, edges)
+        result = g.min_cost_flow(0, n - 1, algorithm)
+        assert (result.cost, result.max_flow) == expected
+        balance = [0] * n
+        for u, v, cap, flow in g.iter_edges():
+            assert 0 <= flow <= cap
+            balance[u] -= flow
+            balance[v] += flow
+        assert all(balance[x] == 0 for x in range(1, n - 1))
@@ -0,0 +1,236 @@
+import random
+
+import pytest
+
+from FlujoMaximo import ALGORITHMS, Graph, LabeledGraph
+
+UNLIMITED = 10 ** 9
+
+
+def random_edges(rng, n, m, top=10):
+    return [(rng.randrange(n), rng.randrange(n), rng.randint(0, top)) for _ in range(m)]
+
+
+def build(n, edges):
+    g = Graph(n)
+    for u, v, w in edges:
+        g.add_edge(u, v, w)
+    return g
+
+
+def brute_force_cut(n, edges, sources, sinks, lower=None):
+    # Referencia independiente: el menor corte entre el superorigen y el superdestino,
+    # probando todos los lados X posibles. Las cotas inferiores de las aristas que
+    # regresan a X restan de su capacidad.
+    sources, sinks = dict(sources), dict(sinks)
+    lower = lower or {}
+    best = None
+    for mask in range(1 << n):
+        side = {x for x in range(n) if mask >> x & 1}
+        value = 0
+        for u, v, w in edges:
+            if u in side and v not in side:
+                value += w
+            elif u not in side and v in side:
+                value -= lower.get((u, v), 0)
+        for x, limit in sources.items():
+            if x not in side:
+                value += UNLIMITED if limit is None else limit
+        for x, limit in sinks.items():
+            if x in side:
+                value += UNLIMITED if limit is None else limit
+        best = value if best is None else min(best, value)
+    return best
+
+
+def balances(n, graph):
+    balance = [0] * n
+    for u, v, cap, flow in graph.iter_edges():
+        assert 0 <= flow <= cap
+        balance[u] -= flow
+        balance[v] += flow
+    return balance
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_self_loops_carry_no_flow(algorithm):
+    g = Graph(2)
+    g.add_edge(0, 0, 5)
+    g.add_edge(0, 1, 3)
+    g.add_edge(1, 1, 4)
+    max_flow, _ = g.max_flow(0, 1, algorithm, trace="off")
+    assert max_flow == 3
+    assert g.get_flows() == [(0, 0, 0), (0, 1, 3), (1, 1, 0)]
+
+
+def test_lowering_a_loaded_self_loop_only_clips_it():
+    g = Graph(2)
+    g.add_edge(0, 0, 5)
+    g.add_edge(0, 1, 3)
+    g.max_flow(0, 1, trace="off")
+    e = g.find_edge(0, 0)
+    g.residual[e] = 0  # lazo cargado, como lo deja una circulación de costo mínimo
+    g.residual[e ^ 1] = 5
+    g.update_capacity(0, 0, 1)
+    assert g.resolve() == 3
+    assert g.get_flows() == [(0, 0, 1), (0, 1, 3)]
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_max_flow_returns_the_total_on_repeated_calls(algorithm):
+    g = Graph(3)
+    g.add_edge(0, 1, 4)
+    g.add_edge(1, 2, 6)
+    g.add_edge(0, 2, 2)
+    assert g.max_flow(0, 2, algorithm, trace="off")[0] == 6
+    assert g.max_flow(0, 2, algorithm, trace="off")[0] == 6
+    g.update_capacity(0, 1, 9)
+    assert g.max_flow(0, 2, algorithm, trace="off")[0] == 8
+
+
+def test_min_cut_after_calling_a_solver_directly():
+    g = Graph(4)
+    g.add_edge(0, 1, 3)
+    g.add_edge(0, 2, 2)
+    g.add_edge(1, 3, 1)
+    g.add_edge(2, 3, 5)
+    max_flow, _ = g.edmonds_karp(0, 3)
+    for side, cut_edges in (g.min_cut(), g.min_cut(0)):
+        assert side == {0, 1}
+        assert sum(cap for _, _, cap in cut_edges) == max_flow == 3
+
+
+def test_direct_solver_calls_keep_the_flow_state():
+    edges = [(0, 1, 3), (0, 2, 2), (1, 3, 1), (2, 3, 5), (1, 2, 4)]
+    for algorithm in ALGORITHMS:
+        g = build(4, edges)
+        assert getattr(g, algorithm)(0, 3)[0] == 5
+        assert g.max_flow(0, 3, algorithm, trace="off")[0] == 5
+        assert g.max_flow(1, 3, algorithm, trace="off")[0] == 5
+        assert getattr(g, algorithm)(0, 3)[0] == 5
+        assert g.resolve() == 5
+
+
+def test_update_capacity_after_multi_flow():
+    g = Graph(4)
+    g.add_edge(0, 2, 5)
+    g.add_edge(1, 2, 5)
+    g.add_edge(2, 3, 8)
+    assert g.multi_flow([0, 1], [3]) == 8
+    g.update_capacity(2, 3, 9)  # sin flujo que recortar no hace falta reparar
+    with pytest.raises(ValueError):
+        g.update_capacity(2, 3, 4)
+    assert g.multi_flow([0, 1], [3]) == 9
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_engines_against_brute_force_cut(seed):
+    rng = random.Random(seed)
+    n = rng.randint(2, 8)
+    edges = random_edges(rng, n, rng.randint(0, 4 * n))
+    source, sink = rng.sample(range(n), 2)
+    expected = brute_force_cut(n, edges, {source: None}, {sink: None})
+    for algorithm in ALGORITHMS:
+        g = build(n, edges)
+        max_flow, _ = g.max_flow(source, sink, algorithm, trace="off")
+        assert max_flow == expected, algorithm
+        balance = balances(n, g)
+        assert all(balance[x] == 0 for x in range(n) if x not in (source, sink))
+        assert balance[sink] == max_flow
+        side, cut_edges = g.min_cut()
+        assert source in side and sink not in side
+        assert sum(cap for _, _, cap in cut_edges) == max_flow
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_dense_engine_matches(seed):
+    pytest.importorskip("numpy")
+    from FlujoMaximo import DenseGraph
+
+    rng = random.Random(seed)
+    n = rng.randint(2, 8)
+    edges = random_edges(rng, n, 3 * n)
+    source, sink = rng.sample(range(n), 2)
+    g = DenseGraph(n)
+    for u, v, w in edges:
+        g.add_edge(u, v, w)
+    max_flow, _ = g.max_flow(source, sink, trace="off")
+    assert max_flow == brute_force_cut(n, edges, {source: None}, {sink: None})
+    assert sum(cap for _, _, cap in g.min_cut()[1]) == max_flow
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_update_capacity_and_resolve_match_a_fresh_solve(seed):
+    rng = random.Random(seed)
+    n = rng.randint(3, 12)
+    edges = random_edges(rng, n, 4 * n, top=20)
+    for algorithm in ALGORITHMS:
+        g = build(n, edges)
+        g.max_flow(0, n - 1, algorithm, trace="off")
+        for _ in range(8):
+            u, v = rng.randrange(n), rng.randrange(n)
+            cap = rng.randint(0, 20)
+            g.update_capacity(u, v, cap)
+            total = g.resolve()
+            reference = Graph(n)
+            for a, b, cap_ab, _ in g.iter_edges():
+                reference.add_edge(a, b, cap_ab)
+            assert total == reference.max_flow(0, n - 1, "dinic", trace="off")[0]
+            balance = balances(n, g)
+            assert all(balance[x] == 0 for x in range(1, n - 1))
+            assert balance[n - 1] == total
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_multi_flow_with_limits_and_lower_bounds(seed):
+    rng = random.Random(seed)
+    n = rng.randint(4, 8)
+    edges = [e for e in random_edges(rng, n, 3 * n) if e[0] != e[1]]
+    nodes = rng.sample(range(n), 4)
+    sources = {s: rng.choice([None, rng.randint(1, 15)]) for s in nodes[:2]}
+    sinks = {t: rng.choice([None, rng.randint(1, 15)]) for t in nodes[2:]}
+
+    # Cotas inferiores tomadas de un flujo que sí existe, para que sean factibles
+    g = build(n, edges)
+    g.multi_flow(sources, sinks)
+    pairs = [(u, v) for u, v, _ in edges]
+    lower = {}
+    for u, v, cap, flow in g.iter_edges():
+        if flow and pairs.count((u, v)) == 1 and rng.random() < 0.5:
+            lower[(u, v)] = rng.randint(0, flow)
+
+    for algorithm in ALGORITHMS:
+        g = build(n, edges)
+        value = g.multi_flow(sources, sinks, algorithm, lower=lower)
+        assert value == brute_force_cut(n, edges, sources, sinks, lower), algorithm
+        balance = balances(n, g)
+        for x in range(n):
+            if x in sources:
+                assert sources[x] is None or -balance[x] <= sources[x]
+            elif x in sinks:
+                assert sinks[x] is None or balance[x] <= sinks[x]
+            else:
+                assert balance[x] == 0
+        assert sum(-balance[s] for s in sources) == value
+        for u, v, _, flow in g.iter_edges():
+            assert flow >= lower.get((u, v), 0)
+
+
+def test_multi_flow_rejects_infeasible_lower_bounds():
+    g = Graph(4)
+    g.add_edge(0, 1, 5)
+    g.add_edge(2, 3, 5)
+    g.add_edge(1, 3, 1)
+    with pytest.raises(ValueError):
+        g.multi_flow([0], [3], lower={(2, 3): 3})
+
+
+def test_labeled_multi_flow():
+    g = LabeledGraph()
+    g.add_edge("a", "x", 4)
+    g.add_edge("b", "x", 4)
+    g.add_edge("x", "c", 5)
+    g.add_edge("x", "d", 9)
+    assert g.multi_flow({"a": None, "b": 3}, ["c", "d"], lower={("x", "c"): 5}) == 7
+    flows = dict(((u, v), f) for u, v, f in g.get_flows())
+    assert flows[("x", "c")] == 5 and flows[("b", "x")] == 3
@@ -0,0 +1,64 @@
+import io
+import random
+
+import pytest
+
+import Formatos
+from FlujoMaximo import ALGORITHMS, Graph, LabeledGraph
+
+
+@pytest.mark.parametrize("text, label", [("12", 12), ("-3", -3), (" 7 ", 7), ("0", 0),
+                                         ("0012", "0012"), ("-0", "-0"), ("+5", "+5"),
+                                         ("1_000", "1_000"), ("²", "²"), ("Norte", "Norte")])
+def test_parse_label(text, label):
+    assert Formatos.parse_label(text) == label
+    assert type(Formatos.parse_label(text)) is type(label)
+
+
+def test_station_codes_keep_leading_zeros():
+    g, _, _ = Formatos.read_graph(io.StringIO("0012 12 5\n12 0012 3\n0012 B 2\n"), "txt", LabeledGraph())
+    out = io.StringIO()
+    Formatos.write_flows(out, g.max_flow("0012", "B", trace="off")[0], g)
+    assert out.getvalue().splitlines() == ["s 2", "f 0012 12 0", "f 12 0012 0", "f 0012 B 2"]
+
+
+def random_graph(seed, n=12):
+    rng = random.Random(seed)
+    g = Graph(n)
+    for _ in range(4 * n):
+        g.add_edge(rng.randrange(n), rng.randrange(n), rng.randint(0, 20))
+    return g
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_binary_round_trip(tmp_path, seed):
+    path = str(tmp_path / "red.fmx")
+    original = random_graph(seed)
+    Formatos.write_binary(path, original)
+    for algorithm in ALGORITHMS:
+        loaded = Formatos.load_binary(path)
+        assert loaded.ROW == original.ROW
+        assert sorted(loaded.iter_edges()) == sorted(random_graph(seed).iter_edges())
+        expected = random_graph(seed).max_flow(0, original.ROW - 1, algorithm, trace="off")[0]
+        assert loaded.max_flow(0, original.ROW - 1, algorithm, trace="off")[0] == expected
+
+
+def test_loaded_graph_leaves_the_file_untouched(tmp_path):
+    path = str(tmp_path / "red.fmx")
+    Formatos.write_binary(path, random_graph(0))
+    before = open(path, "rb").read()
+    Formatos.load_binary(path).max_flow(0, 11, trace="off")
+    assert open(path, "rb").read() == before
+
+
+@pytest.mark.parametrize("field, value", [(0, b"OTRACOSA"), (1, Formatos.BINARY_VERSION + 1), (2, 8)])
+def test_binary_header_is_checked(tmp_path, field, value):
+    path = tmp_path / "red.fmx"
+    Formatos.write_binary(str(path), random_graph(0))
+    data = bytearray(path.read_bytes())
+    header = list(Formatos.BINARY_HEADER.unpack_from(data))
+    header[field] = value
+    Formatos.BINARY_HEADER.pack_into(data, 0, *header)
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        Formatos.load_binary(str(path))
@@ -0,0 +1,66 @@
+import io
+import os
+import random
+import subprocess
+import sys
+
+import Formatos
+from main import EdgeStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_cli_runs_without_tk(tmp_path):
+    path = tmp_path / "red.txt"
+    path.write_text("a b 3\nb c 2\na c 1\n")
+    # Con sys.modules["tkinter"] = None cualquier import de Tk falla
+    script = ("import sys; sys.modules['tkinter'] = None; import main; "
+              f"sys.exit(main.cli([{str(path)!r}, '-s', 'a', '-t', 'c', '--no-flows']))")
+    done = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True)
+    assert done.returncode == 0, done.stderr
+    assert done.stdout == "s 3\n"
+
+
+def check(store, reference):
+    assert sorted(store) == sorted(reference.values())
+    assert len(store) == len(reference)
+    for position, (u, v, w) in enumerate(store):
+        assert store.index[(u, v)] == position
+    degree = {}
+    for u, v, _ in reference.values():
+        degree[u] = degree.get(u, 0) + 1
+        degree[v] = degree.get(v, 0) + 1
+    assert store.degree == degree
+
+
+def test_edge_store_against_a_dict():
+    rng = random.Random(0)
+    store, reference = EdgeStore(), {}
+    for _ in range(500):
+        if reference and rng.random() < 0.4:
+            position = rng.randrange(len(store))
+            u, v, w = store.remove(position)
+            assert reference.pop((u, v)) == (u, v, w)
+        else:
+            u, v, w = rng.randrange(6), rng.randrange(6), rng.randint(1, 9)
+            added = store.add_edge(u, v, w)
+            assert added == ((u, v) not in reference)
+            old = reference.get((u, v), (u, v, 0))[2]
+            reference[(u, v)] = (u, v, old + w)
+        check(store, reference)
+        assert all(store.has_node(x) == (x in store.degree) for x in range(6))
+
+
+def test_removing_the_last_row():
+    store = EdgeStore()
+    store.add_edge("a", "b", 1)
+    store.add_edge("b", "c", 2)
+    assert store.remove(1) == ("b", "c", 2)
+    assert list(store) == [("a", "b", 1)] and ("b", "c") not in store
+    assert not store.has_node("c") and store.has_node("b")
+
+
+def test_bulk_import_merges_repeated_edges():
+    store = EdgeStore()
+    Formatos.READERS["txt"](io.StringIO("a b 3\nb c 2\na b 4\n"), store, Formatos.parse_label)
+    assert list(store) == [("a", "b", 7), ("b", "c", 2)]
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+import Formatos
+import Paralelo
+from FlujoMaximo import Graph
+
+
+def random_graph(seed, n=10):
+    rng = random.Random(seed)
+    g = Graph(n)
+    for _ in range(4 * n):
+        g.add_edge(rng.randrange(n), rng.randrange(n), rng.randint(0, 20))
+    return g
+
+
+def fresh(seed, source, sink, algorithm="dinic"):
+    return random_graph(seed).max_flow(source, sink, algorithm, trace="off")[0]
+
+
+PAIRS = [(0, 9), (9, 0), (1, 5), (3, 3), (2, 7), (0, 9)]
+
+
+@pytest.mark.parametrize("algorithm", ["dinic", "push_relabel"])
+def test_solve_pairs_through_shared_memory(algorithm):
+    results = Paralelo.solve_pairs(random_graph(1), PAIRS, algorithm, workers=2, chunksize=2)
+    assert [r.max_flow for r in results] == [fresh(1, s, t, algorithm) for s, t in PAIRS]
+    # Cada consulta parte del grafo base, no del flujo que dejó la anterior
+    for (source, sink), result in zip(PAIRS, results):
+        inflow = sum(f for _, v, f in result.flows if v == sink)
+        outflow = sum(f for u, _, f in result.flows if u == sink)
+        assert inflow - outflow == result.max_flow or source == sink
+
+
+def test_solve_pairs_from_a_binary_file(tmp_path):
+    path = str(tmp_path / "red.fmx")
+    Formatos.write_binary(path, random_graph(2))
+    results = Paralelo.solve_pairs(path, PAIRS, workers=2, flows=False)
+    assert [r.max_flow for r in results] == [fresh(2, s, t) for s, t in PAIRS]
+    assert all(r.flows is None for r in results)
+
+
+def test_solve_many():
+    jobs = [(random_graph(seed), 0, 9) for seed in range(4)]
+    results = Paralelo.solve_many(jobs, workers=2)
+    assert [r.max_flow for r in results] == [fresh(seed, 0, 9) for seed in range(4)]
+    assert all(r.seconds >= 0 for r in results)
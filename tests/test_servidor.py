@@ -0,0 +1,123 @@
+import asyncio
+import json
+
+import pytest
+
+from Servidor import FlowServer, _parse_graph
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = FlowServer(workers=2)
+    asyncio.run(app.start())
+    yield app
+    app.close()
+
+
+def request(app, method, path, payload=None):
+    # Levanta el servidor en un puerto libre, envía una petición y devuelve
+    # (estado, cuerpo); las respuestas NDJSON se devuelven como lista de objetos
+    async def exchange():
+        server = await asyncio.start_server(app.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            body = b"" if payload is None else json.dumps(payload).encode()
+            writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+
+    head, _, body = asyncio.run(exchange()).partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    if b"chunked" not in head:
+        return status, json.loads(body)
+    lines = []
+    while True:
+        size, _, body = body.partition(b"\r\n")
+        size = int(size, 16)
+        if not size:
+            break
+        lines.append(json.loads(body[:size]))
+        body = body[size + 2:]
+    return status, lines
+
+
+@pytest.mark.parametrize("capacity", [-5, 3.9, "3", True, None])
+def test_bad_capacities_are_rejected(capacity):
+    with pytest.raises(ValueError):
+        _parse_graph([[1, 2, 3], [1, 2, capacity]])
+
+
+def test_parse_graph():
+    edges, graph_id = _parse_graph([["a", "b", 3], [1, 2, 0]])
+    assert edges == [("a", "b", 3), (1, 2, 0)]
+    assert _parse_graph([[1, 2, 0], ["a", "b", 3]])[1] == graph_id
+
+
+@pytest.mark.parametrize("graph", [["x"], {"a": 1}, 7])
+def test_graph_id_must_be_text(app, graph):
+    status, body = request(app, "POST", "/solve", {"graph": graph, "queries": [["a", "b"]]})
+    assert status == 400 and "error" in body
+
+
+def test_unexpected_failures_answer_500(app, monkeypatch):
+    async def broken(body):
+        raise RuntimeError("falla")
+
+    monkeypatch.setattr(app, "_load", broken)
+    status, body = request(app, "POST", "/graphs", {"edges": []})
+    assert status == 500 and "falla" in body["error"]
+
+
+def test_registered_graphs_are_capped(app, monkeypatch):
+    monkeypatch.setattr("Servidor.REGISTERED_GRAPHS", 2)
+    ids = [request(app, "POST", "/graphs", {"edges": [["a", "b", k]]})[1]["graph"] for k in range(3)]
+    assert list(app.graphs) == ids[1:]
+    status, _ = request(app, "POST", "/solve", {"graph": ids[0], "queries": [["a", "b"]]})
+    assert status == 404
+
+
+EDGES = [["s", "a", 3], ["s", "b", 2], ["a", "b", 1], ["a", "t", 2], ["b", "t", 3]]
+
+
+def test_solve_and_registered_graphs(app):
+    status, body = request(app, "POST", "/graphs", {"edges": EDGES})
+    assert status == 200 and body["edges"] == len(EDGES)
+    graph_id = body["graph"]
+    for graph in ({"graph": graph_id}, {"edges": EDGES}):
+        status, rows = request(app, "POST", "/solve", dict(graph, queries=[["s", "t"], ["a", "t"]], flows=True))
+        assert status == 200
+        rows.sort(key=lambda row: row["query"])
+        assert [row["max_flow"] for row in rows] == [5, 3]
+        assert (rows[1]["source"], rows[1]["sink"]) == ("a", "t")
+        assert sum(f for u, v, f in rows[0]["flows"] if v == "t") == 5
+
+
+def test_errors_are_reported_per_query(app):
+    status, rows = request(app, "POST", "/solve", {"edges": EDGES, "queries": [["s", "t"], ["s", "nadie"]]})
+    assert status == 200
+    rows.sort(key=lambda row: row["query"])
+    assert rows[0]["max_flow"] == 5
+    assert "error" in rows[1] and "max_flow" not in rows[1]
+
+
+def test_edges_travel_once_per_worker():
+    # Con un solo trabajador el reparto es determinista: solo el primer lote
+    # necesita las aristas, los siguientes viajan con la huella
+    app = FlowServer(workers=1)
+    asyncio.run(app.start())
+    try:
+        for _ in range(4):
+            status, rows = request(app, "POST", "/solve", {"edges": EDGES, "queries": [["s", "t"]]})
+            assert rows[0]["max_flow"] == 5
+        assert request(app, "GET", "/metrics")[1]["graph_uploads"] == 1
+    finally:
+        app.close()
+
+
+@pytest.mark.parametrize("payload", [{"edges": EDGES}, {"edges": EDGES, "queries": [[["s"], "t"]]},
+                                     {"edges": "x", "queries": []}, [1, 2]])
+def test_bad_requests(app, payload):
+    assert request(app, "POST", "/solve", payload)[0] == 400
@@ -0,0 +1,65 @@
+import pytest
+
+from FlujoMaximo import ALGORITHMS, Graph, LabeledGraph, Trace
+
+EDGES = [(0, 1, 3), (0, 2, 2), (1, 3, 2), (2, 3, 3), (1, 2, 1)]
+
+
+def solve(level, algorithm="edmonds_karp"):
+    g = Graph(4)
+    for u, v, w in EDGES:
+        g.add_edge(u, v, w)
+    return g.max_flow(0, 3, algorithm, trace=level)
+
+
+def test_full_trace_rows():
+    max_flow, table = solve("full")
+    assert len(table) >= 2
+    rows = list(table)
+    assert [row[0] for row in rows] == list(range(1, len(table) + 1))
+    assert rows[-1][3] == max_flow == sum(row[2] for row in rows)
+    for _, edges, path_flow, _ in rows:
+        assert edges[0][0] == 0 and edges[-1][1] == 3
+        assert all(a[1] == b[0] for a, b in zip(edges, edges[1:]))
+        assert path_flow > 0
+    assert table[-1] == rows[-1]
+    assert table[-len(table)] == rows[0]
+
+
+@pytest.mark.parametrize("i", [4, -5, 100])
+def test_out_of_range_index(i):
+    table = Trace()
+    for k in range(4):
+        table.record([0, 1], 1, k + 1)
+    with pytest.raises(IndexError):
+        table[i]
+
+
+def test_summary_keeps_flows_without_paths():
+    full = solve("full")[1]
+    summary = solve("summary")[1]
+    assert len(summary) == len(full)
+    assert len(summary.nodes) == 0
+    assert [(row[0], row[2], row[3]) for row in summary] == [(row[0], row[2], row[3]) for row in full]
+    assert all(row[1] == [] for row in summary)
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_off_records_nothing(algorithm):
+    max_flow, table = solve("off", algorithm)
+    assert max_flow == 5
+    assert len(table) == 0 and list(table) == []
+
+
+def test_unknown_level():
+    with pytest.raises(ValueError):
+        Trace("todo")
+
+
+def test_labels_are_shown_in_paths():
+    g = LabeledGraph()
+    g.add_edge("s", "a", 2)
+    g.add_edge("a", "t", 2)
+    _, table = g.max_flow("s", "t")
+    assert table[0] == (1, [("s", "a"), ("a", "t")], 2, 2)
+    assert table.path(0) == ["s", "a", "t"]